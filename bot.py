@@ -3,9 +3,21 @@ from discord.ext import commands
 import asyncio
 import aiohttp
 import logging
+import logging.handlers
+import queue
 from typing import Optional
 import sys
 
+try:
+    import uvloop  # Faster event loop where available (not on Windows)
+except ImportError:
+    uvloop = None
+
+try:
+    import aiodns  # Lets aiohttp resolve hostnames without the thread pool
+except ImportError:
+    aiodns = None
+
 # ============================================================================
 # CONFIGURATION - UPDATE THESE VALUES
 # ============================================================================
@@ -18,13 +30,21 @@ OWNER_USER_ID = 1234567890  # Your Discord user ID for managing officers
 # ============================================================================
 # LOGGING SETUP
 # ============================================================================
+# Records go through a queue so file/console writes happen off the event loop
+log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+log_handlers = [
+    logging.FileHandler('bankerbot.log'),
+    logging.StreamHandler(sys.stdout)
+]
+for handler in log_handlers:
+    handler.setFormatter(log_formatter)
+
+log_queue = queue.Queue(-1)
+log_listener = logging.handlers.QueueListener(log_queue, *log_handlers)
+
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('bankerbot.log'),
-        logging.StreamHandler(sys.stdout)
-    ]
+    handlers=[logging.handlers.QueueHandler(log_queue)]
 )
 logger = logging.getLogger('BankerBot')
 
@@ -44,13 +64,27 @@ bot.config = {
     'central_bank_server_id': CENTRAL_BANK_SERVER_ID,
     'approval_channel_id': APPROVAL_CHANNEL_ID,
     'owner_user_id': OWNER_USER_ID,
-    'api_delay': 1.0,  # Rate limit delay for API calls
+    'unb_max_rate': 10,  # UnbelievaBoat requests allowed per unb_period
+    'unb_period': 5.0,  # Seconds over which unb_max_rate applies
     'min_exchange_rate': 0.01,
     'max_exchange_rate': 10000.0,
     'min_transfer_amount': 1.0,
-    'max_transfer_amount': 1000000.0
+    'max_transfer_amount': 1000000.0,
+    'disabled_extensions': []  # e.g. ['cogs.broadcast'] to skip loading a feature cog
 }
 
+# Fire-and-forget work shared by all cogs; the set keeps each task alive until it finishes
+bot.background_tasks = set()
+
+def spawn(coro) -> asyncio.Task:
+    """Run a coroutine in the background, keeping a reference until it finishes."""
+    task = asyncio.create_task(coro)
+    bot.background_tasks.add(task)
+    task.add_done_callback(bot.background_tasks.discard)
+    return task
+
+bot.spawn = spawn
+
 # ============================================================================
 # EVENT HANDLERS
 # ============================================================================
@@ -95,23 +129,42 @@ async def on_command_error(ctx, error):
 # ============================================================================
 # LOAD COGS
 # ============================================================================
+STARTUP_EXTENSIONS = [
+    'cogs.database',  # Must be ready before any cog that queries it on load
+    'cogs.unbelievaboat'
+]
+FEATURE_EXTENSIONS = [
+    'cogs.economy',
+    'cogs.admin',
+    'cogs.transfer',
+    'cogs.broadcast'
+]
+
 async def load_extensions():
     """Load all cog extensions."""
-    extensions = [
-        'cogs.database',
-        'cogs.unbelievaboat',
-        'cogs.economy',
-        'cogs.admin',
-        'cogs.transfer',
-        'cogs.broadcast'
-    ]
-    
-    for extension in extensions:
+    for extension in STARTUP_EXTENSIONS:
         try:
             await bot.load_extension(extension)
             logger.info(f'Loaded extension: {extension}')
         except Exception as e:
             logger.error(f'Failed to load extension {extension}: {e}')
+    
+    # Feature cogs this deployment doesn't use are never imported
+    disabled = set(bot.config['disabled_extensions'])
+    extensions = [e for e in FEATURE_EXTENSIONS if e not in disabled]
+    if disabled:
+        logger.info(f'Skipping disabled extensions: {", ".join(sorted(disabled))}')
+    
+    results = await asyncio.gather(
+        *(bot.load_extension(extension) for extension in extensions),
+        return_exceptions=True
+    )
+    
+    for extension, result in zip(extensions, results):
+        if isinstance(result, Exception):
+            logger.error(f'Failed to load extension {extension}: {result}')
+        else:
+            logger.info(f'Loaded extension: {extension}')
 
 # ============================================================================
 # MAIN
@@ -119,13 +172,35 @@ async def load_extensions():
 async def main():
     """Main entry point."""
     async with bot:
-        await load_extensions()
-        await bot.start(DISCORD_TOKEN)
+        # Shared HTTP session for all cogs (pooled connections, cached async DNS)
+        connector = aiohttp.TCPConnector(
+            limit=100,
+            limit_per_host=8,
+            resolver=aiohttp.AsyncResolver() if aiodns else None,
+            ttl_dns_cache=600,
+            keepalive_timeout=75,  # outlive a full rate-limit period so UNB calls reuse one TLS connection
+            enable_cleanup_closed=True
+        )
+        bot.http_session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=30, connect=10)
+        )
+        try:
+            await load_extensions()
+            await bot.start(DISCORD_TOKEN)
+        finally:
+            await bot.http_session.close()
+            logger.info('HTTP session closed')
 
 if __name__ == "__main__":
+    loop_factory = uvloop.new_event_loop if uvloop else None
+    log_listener.start()
     try:
-        asyncio.run(main())
+        with asyncio.Runner(loop_factory=loop_factory) as runner:
+            runner.run(main())
     except KeyboardInterrupt:
         logger.info('Bot shutdown requested')
     except Exception as e:
         logger.error(f'Fatal error: {e}')
+    finally:
+        log_listener.stop()
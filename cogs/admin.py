@@ -2,7 +2,10 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 import logging
-from typing import Optional, List
+import asyncio
+import time
+from itertools import islice
+from typing import Optional, List, Dict, Any, Tuple
 
 logger = logging.getLogger('BankerBot.Admin')
 
@@ -11,26 +14,74 @@ class AdminCommands(commands.Cog):
     
     def __init__(self, bot):
         self.bot = bot
+        self._owner_id = bot.config['owner_user_id']
+        self._officer_lock = asyncio.Lock()
+        self._econ_cache: Optional[Tuple[float, List[Dict[str, Any]]]] = None
+        self._economy_lnames: List[Tuple[str, str]] = []  # (casefolded name, display name)
+        # Owner DM commands: exact matches, then argument-taking prefixes (longest first)
+        self._dm_exact = {
+            'list officers': self._dm_list_officers,
+            'officer help': self._dm_officer_help
+        }
+        self._dm_table = sorted(
+            [
+                ('add officer ', self._dm_add_officer),
+                ('remove officer ', self._dm_remove_officer)
+            ],
+            key=lambda entry: len(entry[0]),
+            reverse=True
+        )
         self.ctx_menu = app_commands.ContextMenu(
             name='Add as Officer',
             callback=self.add_officer_context
         )
         self.bot.tree.add_command(self.ctx_menu)
     
+    async def cog_load(self):
+        await self.refresh_economy_cache()
+    
     def cog_unload(self):
         self.bot.tree.remove_command(self.ctx_menu.name, type=self.ctx_menu.type)
     
     def get_db(self):
         return self.bot.get_cog('Database')
     
+    async def refresh_economy_cache(self):
+        """Re-read approved economies, casefolding names for matching."""
+        db = self.get_db()
+        if not db:
+            return
+        economies = await db.get_all_economies('approved')
+        for economy in economies:
+            economy['lname'] = economy['guild_name'].casefold()
+        self._econ_cache = (time.monotonic(), economies)
+        self._economy_lnames = [(e['lname'], e['guild_name']) for e in economies]
+    
+    async def _cached_economies(self, ttl: float = 5.0) -> List[Dict[str, Any]]:
+        """Approved economies, re-read from the database at most once per ttl seconds."""
+        if self._econ_cache is None or time.monotonic() - self._econ_cache[0] >= ttl:
+            await self.refresh_economy_cache()
+        return self._econ_cache[1] if self._econ_cache else []
+    
+    def _find_notification_channel(self, guild: discord.Guild) -> Optional[discord.TextChannel]:
+        """Find a channel the bot can post to, preferring the guild's system channels."""
+        me = guild.me
+        preferred = (c for c in (guild.system_channel, guild.public_updates_channel) if c)
+        target = next((c for c in preferred if c.permissions_for(me).send_messages), None)
+        if not target:
+            target = next((c for c in guild.text_channels if c.permissions_for(me).send_messages), None)
+        return target
+    
+    def _is_owner(self, user_id: int) -> bool:
+        return user_id == self._owner_id
+    
     async def is_officer_or_owner(self, user_id: int) -> bool:
         """Check if user is an officer or the bot owner."""
-        if user_id == self.bot.config['owner_user_id']:
+        if self._is_owner(user_id):
             return True
+        # Database keeps the officer set in memory, including bulk adds and reloads
         db = self.get_db()
-        if db:
-            return await db.is_officer(user_id)
-        return False
+        return bool(db and await db.is_officer(user_id))
     
     # ========================================================================
     # KICK COMMAND (Officer only)
@@ -64,14 +115,9 @@ class AdminCommands(commands.Cog):
             await interaction.followup.send("❌ Database not available.", ephemeral=True)
             return
         
-        # Find the economy
-        economies = await db.get_all_economies('approved')
-        target_economy = None
-        
-        for economy in economies:
-            if economy['guild_name'].lower() == server_name.lower():
-                target_economy = economy
-                break
+        # Find the economy by casefolded name, the same way the autocomplete matches it
+        key = server_name.casefold()
+        target_economy = next((e for e in await self._cached_economies() if e['lname'] == key), None)
         
         if not target_economy:
             await interaction.followup.send(
@@ -84,6 +130,13 @@ class AdminCommands(commands.Cog):
         success = await db.remove_economy(target_economy['guild_id'])
         
         if success:
+            await self.refresh_economy_cache()
+            transfer = self.bot.get_cog('TransferCommands')
+            if transfer:
+                transfer.invalidate_economy_cache()
+            broadcast = self.bot.get_cog('BroadcastSystem')
+            if broadcast:
+                broadcast.invalidate_economy_cache()
             await db.log_action(
                 'economy_kicked',
                 interaction.user.id,
@@ -100,22 +153,20 @@ class AdminCommands(commands.Cog):
             # Try to notify the kicked server
             try:
                 guild = self.bot.get_guild(target_economy['guild_id'])
-                if guild:
-                    for channel in guild.text_channels:
-                        if channel.permissions_for(guild.me).send_messages:
-                            embed = discord.Embed(
-                                title="⚠️ Removed from Global Economy",
-                                description=f"Your server has been removed from the global economy by a World Bank Officer.",
-                                color=discord.Color.red()
-                            )
-                            embed.add_field(name="Reason", value=reason, inline=False)
-                            embed.add_field(
-                                name="What now?",
-                                value="You can reapply using `/economy optin` if you wish to rejoin.",
-                                inline=False
-                            )
-                            await channel.send(embed=embed)
-                            break
+                channel = self._find_notification_channel(guild) if guild else None
+                if channel:
+                    embed = discord.Embed(
+                        title="⚠️ Removed from Global Economy",
+                        description=f"Your server has been removed from the global economy by a World Bank Officer.",
+                        color=discord.Color.red()
+                    )
+                    embed.add_field(name="Reason", value=reason, inline=False)
+                    embed.add_field(
+                        name="What now?",
+                        value="You can reapply using `/economy optin` if you wish to rejoin.",
+                        inline=False
+                    )
+                    await channel.send(embed=embed)
             except Exception as e:
                 logger.error(f'Failed to notify kicked server: {e}')
         else:
@@ -135,17 +186,11 @@ class AdminCommands(commands.Cog):
         if not await self.is_officer_or_owner(interaction.user.id):
             return []
         
-        db = self.get_db()
-        if not db:
-            return []
-        
-        economies = await db.get_all_economies('approved')
-        filtered = [e for e in economies if current.lower() in e['guild_name'].lower()]
+        await self._cached_economies()
+        cur = current.casefold()
+        matches = islice((name for lname, name in self._economy_lnames if cur in lname), 25)
         
-        return [
-            app_commands.Choice(name=e['guild_name'], value=e['guild_name'])
-            for e in filtered[:25]
-        ]
+        return [app_commands.Choice(name=name, value=name) for name in matches]
     
     # ========================================================================
     # OFFICER MANAGEMENT (Owner only via DM)
@@ -154,98 +199,124 @@ class AdminCommands(commands.Cog):
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
         """Listen for DMs to add/remove officers."""
-        # Only process DMs to the bot
+        # Only the owner can manage officers, and only via DM
+        if not self._is_owner(message.author.id):
+            return
         if not isinstance(message.channel, discord.DMChannel):
             return
         
-        if message.author.bot:
+        content = message.content.strip()
+        if not content:
             return
         
-        # Only owner can manage officers
-        if message.author.id != self.bot.config['owner_user_id']:
+        lowered = content.lower()
+        handler = self._dm_exact.get(lowered)
+        if not handler:
+            for prefix, prefix_handler in self._dm_table:
+                if lowered.startswith(prefix):
+                    handler = prefix_handler
+                    break
+        
+        if not handler:
             return
         
         db = self.get_db()
         if not db:
             return
         
-        content = message.content.strip()
-        
-        # Add officer: "add officer <user_id>"
-        if content.lower().startswith('add officer '):
-            try:
-                user_id = int(content.split()[2])
+        await handler(message, db, content)
+    
+    async def _dm_add_officer(self, message: discord.Message, db, content: str):
+        """Handle `add officer <user_id>`."""
+        try:
+            user_id = int(content.split()[2])
+            async with self._officer_lock:
                 success = await db.add_officer(user_id, message.author.id)
-                
                 if success:
-                    await message.reply(f"✅ Added user {user_id} as a World Bank Officer.")
                     await db.log_action('officer_added', message.author.id, details=f"Officer ID: {user_id}")
-                else:
-                    await message.reply(f"❌ User {user_id} is already an officer or error occurred.")
-            except (IndexError, ValueError):
-                await message.reply("❌ Invalid format. Use: `add officer <user_id>`")
-        
-        # Remove officer: "remove officer <user_id>"
-        elif content.lower().startswith('remove officer '):
-            try:
-                user_id = int(content.split()[2])
+            
+            if success:
+                await message.reply(f"✅ Added user {user_id} as a World Bank Officer.")
+            else:
+                await message.reply(f"❌ User {user_id} is already an officer or error occurred.")
+        except (IndexError, ValueError):
+            await message.reply("❌ Invalid format. Use: `add officer <user_id>`")
+    
+    async def _dm_remove_officer(self, message: discord.Message, db, content: str):
+        """Handle `remove officer <user_id>`."""
+        try:
+            user_id = int(content.split()[2])
+            async with self._officer_lock:
                 success = await db.remove_officer(user_id)
-                
                 if success:
-                    await message.reply(f"✅ Removed user {user_id} from World Bank Officers.")
                     await db.log_action('officer_removed', message.author.id, details=f"Officer ID: {user_id}")
-                else:
-                    await message.reply(f"❌ User {user_id} is not an officer or error occurred.")
-            except (IndexError, ValueError):
-                await message.reply("❌ Invalid format. Use: `remove officer <user_id>`")
-        
-        # List officers: "list officers"
-        elif content.lower() == 'list officers':
-            officers = await db.get_all_officers()
             
-            if not officers:
-                await message.reply("No World Bank Officers registered.")
-                return
-            
-            embed = discord.Embed(
-                title="👮 World Bank Officers",
-                color=discord.Color.blue()
-            )
-            
-            officer_list = []
-            for officer in officers:
-                user = self.bot.get_user(officer['user_id'])
-                if user:
-                    officer_list.append(f"• {user.mention} ({user.id})")
-                else:
-                    officer_list.append(f"• User ID: {officer['user_id']}")
-            
-            embed.description = "\n".join(officer_list) if officer_list else "None"
-            await message.reply(embed=embed)
+            if success:
+                await message.reply(f"✅ Removed user {user_id} from World Bank Officers.")
+            else:
+                await message.reply(f"❌ User {user_id} is not an officer or error occurred.")
+        except (IndexError, ValueError):
+            await message.reply("❌ Invalid format. Use: `remove officer <user_id>`")
+    
+    async def _dm_list_officers(self, message: discord.Message, db, content: str):
+        """Handle `list officers`."""
+        officers = await db.get_all_officers()
         
-        # Help: "officer help"
-        elif content.lower() == 'officer help':
-            embed = discord.Embed(
-                title="🛠️ Officer Management Commands",
-                description="Commands for managing World Bank Officers (Owner only)",
-                color=discord.Color.gold()
-            )
-            embed.add_field(
-                name="Add Officer",
-                value="`add officer <user_id>`\nGrant officer privileges to a user",
-                inline=False
-            )
-            embed.add_field(
-                name="Remove Officer",
-                value="`remove officer <user_id>`\nRevoke officer privileges from a user",
-                inline=False
-            )
-            embed.add_field(
-                name="List Officers",
-                value="`list officers`\nShow all current officers",
-                inline=False
+        if not officers:
+            await message.reply("No World Bank Officers registered.")
+            return
+        
+        embed = discord.Embed(
+            title="👮 World Bank Officers",
+            color=discord.Color.blue()
+        )
+        
+        # Resolve users missing from the cache concurrently
+        users = {o['user_id']: self.bot.get_user(o['user_id']) for o in officers}
+        misses = [user_id for user_id, user in users.items() if user is None]
+        if misses:
+            fetched = await asyncio.gather(
+                *(self.bot.fetch_user(user_id) for user_id in misses),
+                return_exceptions=True
             )
-            await message.reply(embed=embed)
+            for user_id, result in zip(misses, fetched):
+                if isinstance(result, discord.User):
+                    users[user_id] = result
+        
+        officer_list = []
+        for officer in officers:
+            user = users.get(officer['user_id'])
+            if user:
+                officer_list.append(f"• {user.mention} ({user.id})")
+            else:
+                officer_list.append(f"• User ID: {officer['user_id']}")
+        
+        embed.description = "\n".join(officer_list) if officer_list else "None"
+        await message.reply(embed=embed)
+    
+    async def _dm_officer_help(self, message: discord.Message, db, content: str):
+        """Handle `officer help`."""
+        embed = discord.Embed(
+            title="🛠️ Officer Management Commands",
+            description="Commands for managing World Bank Officers (Owner only)",
+            color=discord.Color.gold()
+        )
+        embed.add_field(
+            name="Add Officer",
+            value="`add officer <user_id>`\nGrant officer privileges to a user",
+            inline=False
+        )
+        embed.add_field(
+            name="Remove Officer",
+            value="`remove officer <user_id>`\nRevoke officer privileges from a user",
+            inline=False
+        )
+        embed.add_field(
+            name="List Officers",
+            value="`list officers`\nShow all current officers",
+            inline=False
+        )
+        await message.reply(embed=embed)
     
     # ========================================================================
     # CONTEXT MENU (Owner only)
@@ -253,28 +324,32 @@ class AdminCommands(commands.Cog):
     
     async def add_officer_context(self, interaction: discord.Interaction, user: discord.User):
         """Context menu to add user as officer."""
-        if interaction.user.id != self.bot.config['owner_user_id']:
+        if not self._is_owner(interaction.user.id):
             await interaction.response.send_message(
                 "❌ Only the bot owner can add officers.",
                 ephemeral=True
             )
             return
         
+        await interaction.response.defer(ephemeral=True)
+        
         db = self.get_db()
         if not db:
-            await interaction.response.send_message("❌ Database not available.", ephemeral=True)
+            await interaction.followup.send("❌ Database not available.", ephemeral=True)
             return
         
-        success = await db.add_officer(user.id, interaction.user.id)
+        async with self._officer_lock:
+            success = await db.add_officer(user.id, interaction.user.id)
+            if success:
+                await db.log_action('officer_added', interaction.user.id, details=f"Officer ID: {user.id}")
         
         if success:
-            await db.log_action('officer_added', interaction.user.id, details=f"Officer ID: {user.id}")
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 f"✅ Added {user.mention} as a World Bank Officer.",
                 ephemeral=True
             )
         else:
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 f"❌ {user.mention} is already an officer or error occurred.",
                 ephemeral=True
             )
@@ -1,54 +1,185 @@
 import discord
 from discord.ext import commands, tasks
 import logging
-from typing import Optional, Dict
+from typing import Optional, Dict, Tuple, List, Deque
 import asyncio
 from datetime import datetime
+from collections import deque
+from dataclasses import dataclass
 import json
+import time
 from pathlib import Path
 
 logger = logging.getLogger('BankerBot.Broadcast')
 
+# Recipients sent per window, and the pause between windows (seconds)
+BROADCAST_WINDOW = 30
+BROADCAST_WINDOW_PAUSE = 1.0
+
+# Channel name fragments to broadcast into, best first
+BROADCAST_CHANNEL_PRIORITY: Tuple[str, ...] = ('general', 'announcements', 'economy', 'updates')
+
+# Panel embeds per broadcast type: (title, description, color, footer)
+BROADCAST_TEMPLATES = {
+    'pending': (
+        "📧 Broadcast to Pending Applications",
+        "Click the button below to open a ticket and send a message to all servers "
+        "with **pending** applications.\n\n"
+        "Perfect for:\n"
+        "• Requesting additional information\n"
+        "• Notifying about application reviews\n"
+        "• General updates for applicants",
+        discord.Color.orange,
+        "World Bank Officer only"
+    ),
+    'approved': (
+        "📧 Broadcast to Approved Servers",
+        "Click the button below to open a ticket and send a message to all "
+        "**approved** servers in the global economy.\n\n"
+        "Perfect for:\n"
+        "• Policy updates\n"
+        "• New feature announcements\n"
+        "• Economy-wide notifications",
+        discord.Color.green,
+        "World Bank Officer only"
+    ),
+    'all_economy': (
+        "📧 Broadcast to All Economy Servers",
+        "Click the button below to open a ticket and send a message to "
+        "**all servers** in the economy system (pending, approved, and rejected).\n\n"
+        "Perfect for:\n"
+        "• Economy system announcements\n"
+        "• Application process updates\n"
+        "• Important policy changes",
+        discord.Color.blue,
+        "World Bank Officer only"
+    ),
+    'all_guilds': (
+        "📧 Broadcast to ALL Bot Servers",
+        "Click the button below to open a ticket and send a message to "
+        "**every server the bot is in**, regardless of economy status.\n\n"
+        "Perfect for:\n"
+        "• Critical bot maintenance notices\n"
+        "• Major feature announcements\n"
+        "• Emergency updates\n\n"
+        "⚠️ **Use sparingly** - This reaches ALL servers!",
+        discord.Color.red,
+        "World Bank Officer only • Use with caution"
+    )
+}
+
+@dataclass(slots=True)
+class TicketData:
+    """State for an open broadcast ticket channel."""
+    type: str
+    officer_id: int
+    officer_name: str
+    created_at: str
+    message_content: Optional[str] = None
+    awaiting_confirmation: bool = False
+
 class BroadcastSystem(commands.Cog):
     """Ticket-based broadcasting system for sending messages to economy servers."""
     
     def __init__(self, bot):
         self.bot = bot
+        cfg = bot.config
+        self._owner_id = cfg['owner_user_id']
+        self._cb_guild_id = cfg['central_bank_server_id']
+        self._approval_channel_id = cfg['approval_channel_id']
         self.broadcast_messages: Dict[str, int] = {}  # type -> message_id
-        self.active_tickets: Dict[int, Dict] = {}  # channel_id -> ticket_data
+        self.active_tickets: Dict[int, TicketData] = {}  # channel_id -> ticket_data
         self.log_file = Path('broadcast_log.txt')
         self.message_store_file = Path('broadcast_messages.json')
+        self.channel_store_file = Path('broadcast_channels.json')
+        self._broadcast_channel_cache: Dict[int, int] = {}  # guild_id -> channel_id
         
-        # Load stored message IDs
+        # Load stored message IDs and resolved broadcast channels
         self.load_message_ids()
+        self.load_channel_cache()
         
-        # Start the daily check task
+        # One persistent view per type handles every panel's button
+        self._panel_views = {
+            broadcast_type: BroadcastButtonView(self, broadcast_type)
+            for broadcast_type in BROADCAST_TEMPLATES
+        }
+        for view in self._panel_views.values():
+            self.bot.add_view(view)
+        
+        # Stores are written by _flush_ids only when these are set
+        self._dirty = False
+        self._channels_dirty = False
+        self._log_buffer: Deque[str] = deque(maxlen=10000)
+        self._econ_cache: Dict[str, Tuple[float, List[Dict]]] = {}  # status -> (fetched_at, rows)
+        
+        # Start the daily check task and the periodic store/log flushes
         self.check_broadcast_messages.start()
+        self._flush_ids.start()
+        self._flush_logs.start()
     
-    def cog_unload(self):
+    async def cog_unload(self):
         """Cleanup when cog is unloaded."""
         self.check_broadcast_messages.cancel()
-        self.save_message_ids()
+        self._flush_ids.cancel()
+        self._flush_logs.cancel()
+        await self._flush_ids()
+        await self._flush_logs()
     
     def get_db(self):
         return self.bot.get_cog('Database')
     
+    def invalidate_economy_cache(self):
+        """Drop cached economy lists after an approval, rejection, withdrawal or kick."""
+        self._econ_cache.clear()
+    
+    async def _get_economies(self, key: Optional[str], ttl: float = 60.0) -> List[Dict]:
+        """Economies for a status (None for all), cached for ttl seconds per status."""
+        key = key or '__all__'
+        cached = self._econ_cache.get(key)
+        if cached and time.monotonic() - cached[0] < ttl:
+            return cached[1]
+        
+        db = self.get_db()
+        if not db:
+            return []
+        rows = await db.get_all_economies(key) if key != '__all__' else await db.get_all_economies()
+        self._econ_cache[key] = (time.monotonic(), rows)
+        return rows
+    
     async def is_officer_or_owner(self, user_id: int) -> bool:
         """Check if user is an officer or the bot owner."""
-        if user_id == self.bot.config['owner_user_id']:
+        if user_id == self._owner_id:
             return True
+        # Database keeps the officer set in memory, so this is current after add/remove
         db = self.get_db()
-        if db:
-            return await db.is_officer(user_id)
-        return False
+        return bool(db and await db.is_officer(user_id))
     
-    def save_message_ids(self):
-        """Save broadcast message IDs to file."""
+    async def _write_store(self, path: Path, data: Dict) -> bool:
+        """Serialize on the loop, then write the file in a worker thread. Returns success."""
         try:
-            with open(self.message_store_file, 'w') as f:
-                json.dump(self.broadcast_messages, f)
+            payload = json.dumps(data)
+            await asyncio.to_thread(path.write_text, payload)
+            return True
         except Exception as e:
-            logger.error(f'Failed to save message IDs: {e}')
+            logger.error(f'Failed to save {path}: {e}')
+            return False
+    
+    async def _save_message_ids(self):
+        """Write the message ID store now, leaving it dirty for _flush_ids to retry on failure."""
+        # Cleared before the write so a change made during it still marks the store dirty
+        self._dirty = False
+        if not await self._write_store(self.message_store_file, self.broadcast_messages):
+            self._dirty = True
+    
+    @tasks.loop(minutes=5)
+    async def _flush_ids(self):
+        """Write the message and channel ID stores if they changed."""
+        if self._dirty:
+            await self._save_message_ids()
+        if self._channels_dirty:
+            self._channels_dirty = False
+            if not await self._write_store(self.channel_store_file, self._broadcast_channel_cache):
+                self._channels_dirty = True
     
     def load_message_ids(self):
         """Load broadcast message IDs from file."""
@@ -59,9 +190,70 @@ class BroadcastSystem(commands.Cog):
         except Exception as e:
             logger.error(f'Failed to load message IDs: {e}')
     
+    def load_channel_cache(self):
+        """Load resolved broadcast channel IDs from file."""
+        try:
+            if self.channel_store_file.exists():
+                with open(self.channel_store_file, 'r') as f:
+                    self._broadcast_channel_cache = {
+                        int(guild_id): channel_id for guild_id, channel_id in json.load(f).items()
+                    }
+        except Exception as e:
+            logger.error(f'Failed to load broadcast channels: {e}')
+    
+    def _resolve_broadcast_channel(self, guild: discord.Guild) -> Optional[discord.TextChannel]:
+        """Find the channel to broadcast to in a guild, caching the result."""
+        me = guild.me
+        cid = self._broadcast_channel_cache.get(guild.id)
+        ch = guild.get_channel(cid) if cid else None
+        if ch and ch.permissions_for(me).send_messages:
+            return ch
+        
+        # One pass over the channels: keep the best-ranked common name, else the first usable one
+        best_rank = len(BROADCAST_CHANNEL_PRIORITY)
+        target_channel = None
+        first_usable = None
+        for channel in guild.text_channels:
+            if not channel.permissions_for(me).send_messages:
+                continue
+            if first_usable is None:
+                first_usable = channel
+            name = channel.name.lower()
+            for rank, candidate in enumerate(BROADCAST_CHANNEL_PRIORITY[:best_rank]):
+                if candidate in name:
+                    best_rank, target_channel = rank, channel
+                    break
+            if best_rank == 0:
+                break
+        
+        if target_channel is None:
+            target_channel = first_usable
+        
+        if target_channel:
+            self._broadcast_channel_cache[guild.id] = target_channel.id
+            self._channels_dirty = True
+        elif cid:
+            del self._broadcast_channel_cache[guild.id]
+            self._channels_dirty = True
+        return target_channel
+    
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        """Forget a cached broadcast channel when it is deleted."""
+        if self._broadcast_channel_cache.get(channel.guild.id) == channel.id:
+            del self._broadcast_channel_cache[channel.guild.id]
+            self._channels_dirty = True
+    
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before, after):
+        """Re-resolve a guild's broadcast channel after its cached channel changes."""
+        if self._broadcast_channel_cache.get(after.guild.id) == after.id:
+            del self._broadcast_channel_cache[after.guild.id]
+            self._channels_dirty = True
+    
     def log_broadcast(self, officer_id: int, officer_name: str, target_type: str, 
                      message: str, recipient_count: int):
-        """Log a broadcast to the log file."""
+        """Queue a broadcast log entry; _flush_logs writes it to the log file."""
         try:
             timestamp = datetime.utcnow().isoformat()
             log_entry = (
@@ -70,114 +262,72 @@ class BroadcastSystem(commands.Cog):
                 f"Message: {message[:100]}{'...' if len(message) > 100 else ''}\n"
             )
             
-            with open(self.log_file, 'a', encoding='utf-8') as f:
-                f.write(log_entry)
+            self._log_buffer.append(log_entry)
             
             logger.info(f'Broadcast logged: {target_type} to {recipient_count} servers')
         except Exception as e:
             logger.error(f'Failed to log broadcast: {e}')
     
+    def _append_lines(self, lines: List[str]):
+        """Append buffered log lines to the log file in one write."""
+        with open(self.log_file, 'a', encoding='utf-8') as f:
+            f.write(''.join(lines))
+    
+    @tasks.loop(seconds=30)
+    async def _flush_logs(self):
+        """Write buffered broadcast log entries off the event loop."""
+        if not self._log_buffer:
+            return
+        lines = []
+        while self._log_buffer:
+            lines.append(self._log_buffer.popleft())
+        try:
+            await asyncio.to_thread(self._append_lines, lines)
+        except Exception as e:
+            logger.error(f'Failed to write broadcast log: {e}')
+    
     # ========================================================================
     # SETUP BROADCAST BUTTONS
     # ========================================================================
     
+    @staticmethod
+    def _build_embed(broadcast_type: str) -> discord.Embed:
+        """Build the panel embed for a broadcast type from BROADCAST_TEMPLATES."""
+        title, description, color, footer = BROADCAST_TEMPLATES[broadcast_type]
+        embed = discord.Embed(title=title, description=description, color=color())
+        embed.set_footer(text=footer)
+        return embed
+    
     @commands.command(name='setup_broadcast')
     async def setup_broadcast(self, ctx):
         """Setup the broadcast button messages in the World Bank server."""
         # Check if user is owner
-        if ctx.author.id != self.bot.config['owner_user_id']:
+        if ctx.author.id != self._owner_id:
             await ctx.send("❌ Only the bot owner can use this command.")
             return
         
         # Check if we're in the Central Bank server
-        if ctx.guild.id != self.bot.config['central_bank_server_id']:
+        if ctx.guild.id != self._cb_guild_id:
             await ctx.send("❌ This command can only be used in the Central Bank server.")
             return
         
         channel = ctx.channel
         
-        # Create embeds for each broadcast type
-        pending_embed = discord.Embed(
-            title="📧 Broadcast to Pending Applications",
-            description=(
-                "Click the button below to open a ticket and send a message to all servers "
-                "with **pending** applications.\n\n"
-                "Perfect for:\n"
-                "• Requesting additional information\n"
-                "• Notifying about application reviews\n"
-                "• General updates for applicants"
-            ),
-            color=discord.Color.orange()
-        )
-        pending_embed.set_footer(text="World Bank Officer only")
-        
-        approved_embed = discord.Embed(
-            title="📧 Broadcast to Approved Servers",
-            description=(
-                "Click the button below to open a ticket and send a message to all "
-                "**approved** servers in the global economy.\n\n"
-                "Perfect for:\n"
-                "• Policy updates\n"
-                "• New feature announcements\n"
-                "• Economy-wide notifications"
-            ),
-            color=discord.Color.green()
-        )
-        approved_embed.set_footer(text="World Bank Officer only")
-        
-        all_economy_embed = discord.Embed(
-            title="📧 Broadcast to All Economy Servers",
-            description=(
-                "Click the button below to open a ticket and send a message to "
-                "**all servers** in the economy system (pending, approved, and rejected).\n\n"
-                "Perfect for:\n"
-                "• Economy system announcements\n"
-                "• Application process updates\n"
-                "• Important policy changes"
-            ),
-            color=discord.Color.blue()
-        )
-        all_economy_embed.set_footer(text="World Bank Officer only")
-        
-        all_guilds_embed = discord.Embed(
-            title="📧 Broadcast to ALL Bot Servers",
-            description=(
-                "Click the button below to open a ticket and send a message to "
-                "**every server the bot is in**, regardless of economy status.\n\n"
-                "Perfect for:\n"
-                "• Critical bot maintenance notices\n"
-                "• Major feature announcements\n"
-                "• Emergency updates\n\n"
-                "⚠️ **Use sparingly** - This reaches ALL servers!"
-            ),
-            color=discord.Color.red()
-        )
-        all_guilds_embed.set_footer(text="World Bank Officer only • Use with caution")
-        
-        # Send messages with buttons
-        pending_view = BroadcastButtonView(self, 'pending')
-        approved_view = BroadcastButtonView(self, 'approved')
-        all_economy_view = BroadcastButtonView(self, 'all_economy')
-        all_guilds_view = BroadcastButtonView(self, 'all_guilds')
-        
-        pending_msg = await channel.send(embed=pending_embed, view=pending_view)
-        approved_msg = await channel.send(embed=approved_embed, view=approved_view)
-        all_economy_msg = await channel.send(embed=all_economy_embed, view=all_economy_view)
-        all_guilds_msg = await channel.send(embed=all_guilds_embed, view=all_guilds_view)
-        
-        # Store message IDs
-        self.broadcast_messages['pending'] = pending_msg.id
-        self.broadcast_messages['approved'] = approved_msg.id
-        self.broadcast_messages['all_economy'] = all_economy_msg.id
-        self.broadcast_messages['all_guilds'] = all_guilds_msg.id
-        self.save_message_ids()
+        # Send one panel per broadcast type
+        panels = {}
+        for broadcast_type in BROADCAST_TEMPLATES:
+            view = self._panel_views[broadcast_type]
+            panels[broadcast_type] = await channel.send(embed=self._build_embed(broadcast_type), view=view)
+            self.broadcast_messages[broadcast_type] = panels[broadcast_type].id
+        # Panels are created rarely, so persist their IDs right away rather than on the next flush
+        await self._save_message_ids()
         
         await ctx.send(
             f"✅ Broadcast system setup complete!\n\n"
-            f"**Pending Applications:** {pending_msg.jump_url}\n"
-            f"**Approved Servers:** {approved_msg.jump_url}\n"
-            f"**All Economy Servers:** {all_economy_msg.jump_url}\n"
-            f"**ALL Bot Servers:** {all_guilds_msg.jump_url}"
+            f"**Pending Applications:** {panels['pending'].jump_url}\n"
+            f"**Approved Servers:** {panels['approved'].jump_url}\n"
+            f"**All Economy Servers:** {panels['all_economy'].jump_url}\n"
+            f"**ALL Bot Servers:** {panels['all_guilds'].jump_url}"
         )
     
     # ========================================================================
@@ -190,65 +340,48 @@ class BroadcastSystem(commands.Cog):
         await self.bot.wait_until_ready()
         
         try:
-            central_bank = self.bot.get_guild(self.bot.config['central_bank_server_id'])
+            central_bank = self.bot.get_guild(self._cb_guild_id)
             if not central_bank:
                 return
             
-            approval_channel = central_bank.get_channel(self.bot.config['approval_channel_id'])
+            approval_channel = central_bank.get_channel(self._approval_channel_id)
             if not approval_channel:
                 return
             
+            if not self.broadcast_messages:
+                return
+            
+            # One history scan starting at the oldest panel instead of a fetch per panel
+            wanted_ids = set(self.broadcast_messages.values())
+            present_ids = set()
+            oldest = discord.Object(id=min(wanted_ids) - 1)
+            async for msg in approval_channel.history(limit=200, after=oldest):
+                if msg.author == self.bot.user and msg.id in wanted_ids:
+                    present_ids.add(msg.id)
+                    if present_ids == wanted_ids:
+                        break
+            
             for broadcast_type, message_id in list(self.broadcast_messages.items()):
+                if message_id in present_ids:
+                    continue
+                
+                # Panels set up far apart may be outside the scanned window
                 try:
-                    message = await approval_channel.fetch_message(message_id)
+                    await approval_channel.fetch_message(message_id)
+                    continue
                 except discord.NotFound:
-                    # Message was deleted, recreate it
-                    logger.warning(f'Broadcast message for {broadcast_type} was deleted, recreating...')
-                    
-                    if broadcast_type == 'pending':
-                        embed = discord.Embed(
-                            title="📧 Broadcast to Pending Applications",
-                            description=(
-                                "Click the button below to open a ticket and send a message to all servers "
-                                "with **pending** applications."
-                            ),
-                            color=discord.Color.orange()
-                        )
-                    elif broadcast_type == 'approved':
-                        embed = discord.Embed(
-                            title="📧 Broadcast to Approved Servers",
-                            description=(
-                                "Click the button below to open a ticket and send a message to all "
-                                "**approved** servers in the global economy."
-                            ),
-                            color=discord.Color.green()
-                        )
-                    elif broadcast_type == 'all_economy':
-                        embed = discord.Embed(
-                            title="📧 Broadcast to All Economy Servers",
-                            description=(
-                                "Click the button below to open a ticket and send a message to "
-                                "**all servers** in the economy system."
-                            ),
-                            color=discord.Color.blue()
-                        )
-                    else:  # all_guilds
-                        embed = discord.Embed(
-                            title="📧 Broadcast to ALL Bot Servers",
-                            description=(
-                                "Click the button below to open a ticket and send a message to "
-                                "**every server the bot is in**."
-                            ),
-                            color=discord.Color.red()
-                        )
-                    
-                    embed.set_footer(text="World Bank Officer only")
-                    view = BroadcastButtonView(self, broadcast_type)
-                    new_message = await approval_channel.send(embed=embed, view=view)
-                    
-                    self.broadcast_messages[broadcast_type] = new_message.id
-                    self.save_message_ids()
-                    
+                    pass
+                
+                # Message was deleted, recreate it
+                logger.warning(f'Broadcast message for {broadcast_type} was deleted, recreating...')
+                
+                embed = self._build_embed(broadcast_type)
+                view = self._panel_views[broadcast_type]
+                new_message = await approval_channel.send(embed=embed, view=view)
+                
+                self.broadcast_messages[broadcast_type] = new_message.id
+                await self._save_message_ids()
+            
         except Exception as e:
             logger.error(f'Error in broadcast message check: {e}')
     
@@ -296,27 +429,23 @@ class BroadcastSystem(commands.Cog):
         )
         
         # Store ticket data
-        self.active_tickets[ticket_channel.id] = {
-            'type': broadcast_type,
-            'officer_id': interaction.user.id,
-            'officer_name': str(interaction.user),
-            'created_at': datetime.utcnow().isoformat(),
-            'message_content': None,
-            'awaiting_confirmation': False
-        }
+        self.active_tickets[ticket_channel.id] = TicketData(
+            type=broadcast_type,
+            officer_id=interaction.user.id,
+            officer_name=str(interaction.user),
+            created_at=datetime.utcnow().isoformat()
+        )
         
         # Get recipient count
-        db = self.get_db()
-        
         if broadcast_type == 'all_guilds':
             recipient_count = len(self.bot.guilds)
             recipients_desc = "ALL servers the bot is in"
         elif broadcast_type == 'all_economy':
-            recipients = await db.get_all_economies()
+            recipients = await self._get_economies(None)
             recipient_count = len(recipients)
             recipients_desc = "All economy servers (pending, approved, rejected)"
         else:
-            recipients = await db.get_all_economies(broadcast_type)
+            recipients = await self._get_economies(broadcast_type)
             recipient_count = len(recipients)
             recipients_desc = f"{broadcast_type.capitalize()} servers"
         
@@ -356,27 +485,43 @@ class BroadcastSystem(commands.Cog):
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
         """Listen for messages in ticket channels."""
-        # Ignore bot messages
-        if message.author.bot:
+        # Ignore bot messages and DMs
+        if message.author.bot or message.guild is None:
             return
         
         # Check if this is a ticket channel
-        if message.channel.id not in self.active_tickets:
+        ticket_data = self.active_tickets.get(message.channel.id)
+        if ticket_data is None:
             return
         
-        ticket_data = self.active_tickets[message.channel.id]
-        
         # If already awaiting confirmation, ignore new messages
-        if ticket_data['awaiting_confirmation']:
+        if ticket_data.awaiting_confirmation:
             return
         
         # Store the message
-        ticket_data['message_content'] = message.content
-        ticket_data['awaiting_confirmation'] = True
+        ticket_data.message_content = message.content
+        ticket_data.awaiting_confirmation = True
         
+        # Build the confirmation without holding up listener dispatch
+        self.bot.spawn(self._prepare_confirmation(message, ticket_data))
+    
+    async def _prepare_confirmation(self, message: discord.Message, ticket_data: TicketData):
+        """Run _send_confirmation, reopening the ticket for input if it fails."""
+        try:
+            await self._send_confirmation(message, ticket_data)
+        except Exception as e:
+            logger.error(f'Failed to prepare broadcast confirmation: {e}')
+            ticket_data.awaiting_confirmation = False
+            ticket_data.message_content = None
+            try:
+                await message.channel.send("❌ Failed to prepare the broadcast. Please send your message again.")
+            except discord.HTTPException:
+                pass
+    
+    async def _send_confirmation(self, message: discord.Message, ticket_data: TicketData):
+        """Fetch recipients and post the broadcast confirmation prompt."""
         # Get recipients
-        db = self.get_db()
-        broadcast_type = ticket_data['type']
+        broadcast_type = ticket_data.type
         
         if broadcast_type == 'all_guilds':
             # Get ALL guilds bot is in
@@ -385,9 +530,9 @@ class BroadcastSystem(commands.Cog):
                 for guild in self.bot.guilds
             ]
         elif broadcast_type == 'all_economy':
-            recipients = await db.get_all_economies()
+            recipients = await self._get_economies(None)
         else:
-            recipients = await db.get_all_economies(broadcast_type)
+            recipients = await self._get_economies(broadcast_type)
         
         # Send confirmation
         embed = discord.Embed(
@@ -433,7 +578,7 @@ class BroadcastSystem(commands.Cog):
             )
         
         view = ConfirmBroadcastView(self, message.channel.id, recipients)
-        await message.channel.send(embed=embed, view=view)
+        view.message = await message.channel.send(embed=embed, view=view)
     
     # ========================================================================
     # SEND BROADCAST
@@ -445,8 +590,8 @@ class BroadcastSystem(commands.Cog):
             return False, "Ticket not found"
         
         ticket_data = self.active_tickets[channel_id]
-        message_content = ticket_data['message_content']
-        broadcast_type = ticket_data['type']
+        message_content = ticket_data.message_content
+        broadcast_type = ticket_data.type
         
         ticket_channel = self.bot.get_channel(channel_id)
         if not ticket_channel:
@@ -460,68 +605,49 @@ class BroadcastSystem(commands.Cog):
         )
         status_message = await ticket_channel.send(embed=status_embed)
         
-        # Send to each server
+        # Send in windows of concurrent sends, pausing between windows to stay under
+        # Discord's global message burst; per-route buckets handle the rest
+        broadcast_embed = discord.Embed(
+            title="📢 Message from World Bank",
+            description=message_content,
+            color=discord.Color.blue(),
+            timestamp=discord.utils.utcnow()
+        )
+        broadcast_embed.set_footer(text="BankerBot Global Economy System")
+        
+        sem = asyncio.Semaphore(10)
+        results = []
+        for i in range(0, len(recipients), BROADCAST_WINDOW):
+            batch = recipients[i:i + BROADCAST_WINDOW]
+            results.extend(await asyncio.gather(
+                *(self._send_one(recipient, broadcast_embed, sem) for recipient in batch),
+                return_exceptions=True
+            ))
+            if i + BROADCAST_WINDOW < len(recipients):
+                await asyncio.sleep(BROADCAST_WINDOW_PAUSE)
+        
         sent_count = 0
         failed_count = 0
         failed_servers = []
         
-        for recipient in recipients:
-            try:
-                guild = self.bot.get_guild(recipient['guild_id'])
-                if not guild:
-                    failed_count += 1
-                    failed_servers.append(f"{recipient['guild_name']} (Bot not in server)")
-                    continue
-                
-                # Try to find a suitable channel
-                target_channel = None
-                
-                # Try common channel names first
-                for channel_name in ['general', 'announcements', 'economy', 'updates']:
-                    for channel in guild.text_channels:
-                        if channel_name in channel.name.lower():
-                            if channel.permissions_for(guild.me).send_messages:
-                                target_channel = channel
-                                break
-                    if target_channel:
-                        break
-                
-                # If no common channel found, use first available
-                if not target_channel:
-                    for channel in guild.text_channels:
-                        if channel.permissions_for(guild.me).send_messages:
-                            target_channel = channel
-                            break
-                
-                if not target_channel:
-                    failed_count += 1
-                    failed_servers.append(f"{recipient['guild_name']} (No accessible channel)")
-                    continue
-                
-                # Send message
-                broadcast_embed = discord.Embed(
-                    title="📢 Message from World Bank",
-                    description=message_content,
-                    color=discord.Color.blue(),
-                    timestamp=discord.utils.utcnow()
-                )
-                broadcast_embed.set_footer(text="BankerBot Global Economy System")
-                
-                await target_channel.send(embed=broadcast_embed)
+        for recipient, result in zip(recipients, results):
+            if isinstance(result, Exception):
+                logger.error(f'Failed to send to {recipient["guild_name"]}: {result}')
+                result = (False, f"Error: {str(result)[:50]}")
+            
+            ok, error = result
+            if ok:
                 sent_count += 1
-                
-                # Small delay to avoid rate limits
-                await asyncio.sleep(0.5)
-                
-            except Exception as e:
-                logger.error(f'Failed to send to {recipient["guild_name"]}: {e}')
+            else:
                 failed_count += 1
-                failed_servers.append(f"{recipient['guild_name']} (Error: {str(e)[:50]})")
+                # Names are only listed when there are 10 or fewer failures
+                if failed_count <= 10:
+                    failed_servers.append(f"{recipient['guild_name']} ({error})")
         
         # Log the broadcast
         self.log_broadcast(
-            ticket_data['officer_id'],
-            ticket_data['officer_name'],
+            ticket_data.officer_id,
+            ticket_data.officer_name,
             broadcast_type,
             message_content,
             sent_count
@@ -535,30 +661,55 @@ class BroadcastSystem(commands.Cog):
         result_embed.add_field(name="Sent", value=str(sent_count), inline=True)
         result_embed.add_field(name="Failed", value=str(failed_count), inline=True)
         
-        if failed_servers and len(failed_servers) <= 10:
+        if 0 < failed_count <= 10:
             result_embed.add_field(
                 name="Failed Servers",
                 value="\n".join(failed_servers),
                 inline=False
             )
-        elif failed_servers:
+        elif failed_count:
             result_embed.add_field(
                 name="Failed Servers",
-                value=f"{len(failed_servers)} servers failed. Check logs for details.",
+                value=f"{failed_count} servers failed. Check logs for details.",
                 inline=False
             )
         
         await status_message.edit(embed=result_embed)
         
         # Close the ticket after 30 seconds
+        self.bot.spawn(self._cleanup_ticket(channel_id, ticket_channel))
+        
+        return True, f"Sent to {sent_count}/{len(recipients)} servers"
+    
+    async def _cleanup_ticket(self, channel_id: int, ticket_channel):
+        """Delete a finished ticket channel after a short delay."""
         await asyncio.sleep(30)
         try:
             await ticket_channel.delete(reason="Broadcast completed")
-            del self.active_tickets[channel_id]
-        except:
-            pass
-        
-        return True, f"Sent to {sent_count}/{len(recipients)} servers"
+        except Exception as e:
+            logger.error(f'Failed to delete ticket channel {channel_id}: {e}')
+        finally:
+            self.active_tickets.pop(channel_id, None)
+    
+    async def _send_one(self, recipient: Dict, broadcast_embed: discord.Embed,
+                        sem: asyncio.Semaphore) -> Tuple[bool, Optional[str]]:
+        """Send the broadcast to a single recipient, returning (ok, error)."""
+        async with sem:
+            try:
+                guild = self.bot.get_guild(recipient['guild_id'])
+                if not guild:
+                    return False, "Bot not in server"
+                
+                target_channel = self._resolve_broadcast_channel(guild)
+                if not target_channel:
+                    return False, "No accessible channel"
+                
+                await target_channel.send(embed=broadcast_embed)
+                return True, None
+                
+            except Exception as e:
+                logger.error(f'Failed to send to {recipient["guild_name"]}: {e}')
+                return False, f"Error: {str(e)[:50]}"
     
     # ========================================================================
     # SPECIFIC SERVER BROADCAST (Command-based)
@@ -575,16 +726,10 @@ class BroadcastSystem(commands.Cog):
             await ctx.send("❌ You are not authorized to use this command.")
             return
         
-        db = self.get_db()
-        
         # Find the server
-        all_economies = await db.get_all_economies()
-        target_economy = None
-        
-        for economy in all_economies:
-            if economy['guild_name'].lower() == server_name.lower():
-                target_economy = economy
-                break
+        all_economies = await self._get_economies(None)
+        name_index = {e['guild_name'].lower(): e for e in all_economies}
+        target_economy = name_index.get(server_name.lower())
         
         if not target_economy:
             await ctx.send(f"❌ Server '{server_name}' not found in the economy system.")
@@ -597,22 +742,7 @@ class BroadcastSystem(commands.Cog):
             return
         
         # Find a channel
-        target_channel = None
-        for channel_name in ['general', 'announcements', 'economy', 'updates']:
-            for channel in guild.text_channels:
-                if channel_name in channel.name.lower():
-                    if channel.permissions_for(guild.me).send_messages:
-                        target_channel = channel
-                        break
-            if target_channel:
-                break
-        
-        if not target_channel:
-            for channel in guild.text_channels:
-                if channel.permissions_for(guild.me).send_messages:
-                    target_channel = channel
-                    break
-        
+        target_channel = self._resolve_broadcast_channel(guild)
         if not target_channel:
             await ctx.send(f"❌ No accessible channel found in '{server_name}'.")
             return
@@ -656,7 +786,7 @@ class BroadcastSystem(commands.Cog):
         
         ticket_data = self.active_tickets[ctx.channel.id]
         
-        if ctx.author.id != ticket_data['officer_id']:
+        if ctx.author.id != ticket_data.officer_id:
             await ctx.send("❌ Only the officer who created this ticket can close it.")
             return
         
@@ -680,6 +810,8 @@ class BroadcastButtonView(discord.ui.View):
         super().__init__(timeout=None)
         self.cog = cog
         self.broadcast_type = broadcast_type
+        # Stable per-type ID so bot.add_view can route clicks after a restart
+        self.create_ticket_button.custom_id = f"broadcast:{broadcast_type}"
     
     @discord.ui.button(
         label="Create Broadcast Ticket",
@@ -714,6 +846,23 @@ class ConfirmBroadcastView(discord.ui.View):
         self.cog = cog
         self.channel_id = channel_id
         self.recipients = recipients
+        self.message: Optional[discord.Message] = None
+    
+    async def on_timeout(self):
+        """Release the recipient list and let the officer write a new message."""
+        self.recipients = []
+        ticket_data = self.cog.active_tickets.get(self.channel_id)
+        if ticket_data:
+            ticket_data.awaiting_confirmation = False
+            ticket_data.message_content = None
+        
+        for item in self.children:
+            item.disabled = True
+        if self.message:
+            try:
+                await self.message.edit(view=self)
+            except discord.HTTPException:
+                pass
     
     @discord.ui.button(label="Confirm & Send", style=discord.ButtonStyle.green, emoji="✅")
     async def confirm(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -723,7 +872,7 @@ class ConfirmBroadcastView(discord.ui.View):
             return
         
         ticket_data = self.cog.active_tickets[self.channel_id]
-        if interaction.user.id != ticket_data['officer_id']:
+        if interaction.user.id != ticket_data.officer_id:
             await interaction.response.send_message(
                 "❌ Only the ticket owner can confirm.",
                 ephemeral=True
@@ -731,6 +880,7 @@ class ConfirmBroadcastView(discord.ui.View):
             return
         
         await interaction.response.defer()
+        self.stop()
         
         # Disable buttons
         for item in self.children:
@@ -739,6 +889,7 @@ class ConfirmBroadcastView(discord.ui.View):
         
         # Send the broadcast
         success, message = await self.cog.send_broadcast(self.channel_id, self.recipients)
+        self.recipients = []
         
         if not success:
             await interaction.followup.send(f"❌ Broadcast failed: {message}")
@@ -751,7 +902,7 @@ class ConfirmBroadcastView(discord.ui.View):
             return
         
         ticket_data = self.cog.active_tickets[self.channel_id]
-        if interaction.user.id != ticket_data['officer_id']:
+        if interaction.user.id != ticket_data.officer_id:
             await interaction.response.send_message(
                 "❌ Only the ticket owner can cancel.",
                 ephemeral=True
@@ -759,8 +910,10 @@ class ConfirmBroadcastView(discord.ui.View):
             return
         
         # Reset awaiting confirmation
-        ticket_data['awaiting_confirmation'] = False
-        ticket_data['message_content'] = None
+        ticket_data.awaiting_confirmation = False
+        ticket_data.message_content = None
+        self.recipients = []
+        self.stop()
         
         await interaction.response.send_message("❌ Broadcast cancelled. You can type a new message.", ephemeral=True)
         
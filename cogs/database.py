@@ -1,83 +1,254 @@
 import discord
 from discord.ext import commands
 import aiosqlite
+import asyncio
 import logging
-from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from itertools import chain
+from typing import Optional, List, Dict, Any, Tuple
 
 logger = logging.getLogger('BankerBot.Database')
 
+# Table definitions. Timestamps are INTEGER Unix-epoch microseconds (UTC).
+SCHEMA = {
+    'economies': '''
+        CREATE TABLE IF NOT EXISTS economies (
+            guild_id INTEGER PRIMARY KEY,
+            guild_name TEXT NOT NULL,
+            currency_name TEXT NOT NULL,
+            currency_symbol TEXT NOT NULL,
+            rate_usd REAL NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            application_note TEXT,
+            applied_by INTEGER NOT NULL,
+            applied_at INTEGER NOT NULL,
+            approved_at INTEGER,
+            approved_by INTEGER,
+            announcement_channel_id INTEGER
+        )
+    ''',
+    'transfers': '''
+        CREATE TABLE IF NOT EXISTS transfers (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            from_guild_id INTEGER NOT NULL,
+            to_guild_id INTEGER NOT NULL,
+            amount_source REAL NOT NULL,
+            amount_target REAL NOT NULL,
+            source_currency TEXT NOT NULL,
+            target_currency TEXT NOT NULL,
+            wallet_type TEXT NOT NULL,
+            timestamp INTEGER NOT NULL,
+            exchange_rate REAL NOT NULL
+        )
+    ''',
+    'approved_officers': '''
+        CREATE TABLE IF NOT EXISTS approved_officers (
+            user_id INTEGER PRIMARY KEY,
+            added_at INTEGER NOT NULL,
+            added_by INTEGER NOT NULL
+        )
+    ''',
+    'audit_log': '''
+        CREATE TABLE IF NOT EXISTS audit_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            action TEXT NOT NULL,
+            user_id INTEGER NOT NULL,
+            guild_id INTEGER,
+            details TEXT,
+            timestamp INTEGER NOT NULL
+        )
+    ''',
+}
+
+# Columns that older databases stored as ISO-8601 text
+TIMESTAMP_COLUMNS = {
+    'economies': ('applied_at', 'approved_at'),
+    'transfers': ('timestamp',),
+    'approved_officers': ('added_at',),
+    'audit_log': ('timestamp',),
+}
+
+# Columns added after a table was first released, with their declared types
+ADDED_COLUMNS = {
+    'economies': {'announcement_channel_id': 'INTEGER'},
+}
+
+def utc_now_us() -> int:
+    """Current UTC time as Unix-epoch microseconds.
+    
+    Insert methods accept an optional ``ts`` so batch callers can compute it once.
+    """
+    return time.time_ns() // 1000
+
+# Statements reused verbatim so each connection's statement cache can hit
+INSERT_TRANSFER_SQL = '''
+    INSERT INTO transfers 
+    (user_id, from_guild_id, to_guild_id, amount_source, 
+     amount_target, source_currency, target_currency, 
+     wallet_type, timestamp, exchange_rate)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+INSERT_AUDIT_SQL = '''
+    INSERT INTO audit_log (action, user_id, guild_id, details, timestamp)
+    VALUES (?, ?, ?, ?, ?)
+'''
+
+class ConnectionPool:
+    """Small pool of reusable aiosqlite connections."""
+    
+    def __init__(self, db_path: str, pool_size: int = 5):
+        self.db_path = db_path
+        self.pool_size = pool_size
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._all: List[aiosqlite.Connection] = []
+        self._lock = asyncio.Lock()
+    
+    async def _connect(self) -> aiosqlite.Connection:
+        """Open a new connection with the pragmas applied once."""
+        conn = await aiosqlite.connect(self.db_path)
+        conn.row_factory = aiosqlite.Row
+        await conn.execute('PRAGMA journal_mode=WAL')
+        await conn.execute('PRAGMA synchronous=NORMAL')
+        await conn.execute('PRAGMA temp_store=MEMORY')
+        await conn.execute('PRAGMA mmap_size=268435456')
+        await conn.execute('PRAGMA cache_size=-64000')
+        await conn.execute('PRAGMA busy_timeout=5000')
+        return conn
+    
+    async def _acquire(self) -> aiosqlite.Connection:
+        if self._idle.empty():
+            async with self._lock:
+                if len(self._all) < self.pool_size:
+                    conn = await self._connect()
+                    self._all.append(conn)
+                    return conn
+        return await self._idle.get()
+    
+    async def _release(self, conn: aiosqlite.Connection):
+        if conn.in_transaction:
+            await conn.rollback()
+        self._idle.put_nowait(conn)
+    
+    @asynccontextmanager
+    async def connection(self):
+        """Borrow a connection for the duration of the block."""
+        conn = await self._acquire()
+        try:
+            yield conn
+        finally:
+            await self._release(conn)
+    
+    async def close(self):
+        """Close every connection opened by the pool."""
+        for conn in self._all:
+            await conn.close()
+        self._all.clear()
+        self._idle = asyncio.Queue()
+
 class Database(commands.Cog):
     """Handles all database operations for BankerBot."""
     
     def __init__(self, bot):
         self.bot = bot
         self.db_path = 'bankerbot.db'
-        bot.loop.create_task(self.init_database())
+        self.pool = ConnectionPool(self.db_path, pool_size=5)
+        self._audit_q: asyncio.Queue = asyncio.Queue()
+        self._officers: Optional[set] = None
+        self._econ_cache: OrderedDict = OrderedDict()
+        self._econ_cache_size = 500
+        self._audit_task: Optional[asyncio.Task] = None
+    
+    async def cog_load(self):
+        """Create the schema before any command can query it, then start the audit writer."""
+        await self.init_database()
+        self._audit_task = asyncio.create_task(self._flush_audit())
+    
+    async def cog_unload(self):
+        """Flush pending audit rows and close pooled connections."""
+        if self._audit_task:
+            self._audit_task.cancel()
+            try:
+                await self._audit_task
+            except asyncio.CancelledError:
+                pass
+        await self.pool.close()
+        logger.info('Database connection pool closed')
     
     async def init_database(self):
         """Initialize database tables."""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                # Economies table
+            async with self.pool.connection() as db:
+                for table, create_sql in SCHEMA.items():
+                    await self._migrate_timestamps(db, table)
+                    await db.execute(create_sql)
+                    await self._add_missing_columns(db, table)
+                
+                # Case-insensitive economy name lookups
                 await db.execute('''
-                    CREATE TABLE IF NOT EXISTS economies (
-                        guild_id INTEGER PRIMARY KEY,
-                        guild_name TEXT NOT NULL,
-                        currency_name TEXT NOT NULL,
-                        currency_symbol TEXT NOT NULL,
-                        rate_usd REAL NOT NULL,
-                        status TEXT NOT NULL DEFAULT 'pending',
-                        application_note TEXT,
-                        applied_by INTEGER NOT NULL,
-                        applied_at TEXT NOT NULL,
-                        approved_at TEXT,
-                        approved_by INTEGER
-                    )
+                    CREATE INDEX IF NOT EXISTS idx_econ_name_approved
+                    ON economies(guild_name COLLATE NOCASE, status)
                 ''')
                 
-                # Transfers table
+                # Per-user history, transfer cleanup and status listings
                 await db.execute('''
-                    CREATE TABLE IF NOT EXISTS transfers (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        user_id INTEGER NOT NULL,
-                        from_guild_id INTEGER NOT NULL,
-                        to_guild_id INTEGER NOT NULL,
-                        amount_source REAL NOT NULL,
-                        amount_target REAL NOT NULL,
-                        source_currency TEXT NOT NULL,
-                        target_currency TEXT NOT NULL,
-                        wallet_type TEXT NOT NULL,
-                        timestamp TEXT NOT NULL,
-                        exchange_rate REAL NOT NULL
-                    )
+                    CREATE INDEX IF NOT EXISTS idx_transfers_user_ts
+                    ON transfers(user_id, timestamp DESC)
                 ''')
-                
-                # Approved officers table
                 await db.execute('''
-                    CREATE TABLE IF NOT EXISTS approved_officers (
-                        user_id INTEGER PRIMARY KEY,
-                        added_at TEXT NOT NULL,
-                        added_by INTEGER NOT NULL
-                    )
+                    CREATE INDEX IF NOT EXISTS idx_transfers_ts
+                    ON transfers(timestamp)
                 ''')
-                
-                # Audit log table
                 await db.execute('''
-                    CREATE TABLE IF NOT EXISTS audit_log (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        action TEXT NOT NULL,
-                        user_id INTEGER NOT NULL,
-                        guild_id INTEGER,
-                        details TEXT,
-                        timestamp TEXT NOT NULL
-                    )
+                    CREATE INDEX IF NOT EXISTS idx_economies_status_applied
+                    ON economies(status, applied_at DESC)
                 ''')
                 
                 await db.commit()
                 logger.info('Database initialized successfully')
+            
+            await self.reload_officers()
         except Exception as e:
-            logger.error(f'Failed to initialize database: {e}')
+            logger.error('Failed to initialize database: %s', e)
+    
+    async def _migrate_timestamps(self, db: aiosqlite.Connection, table: str):
+        """Rebuild a table whose timestamp columns are still ISO text."""
+        async with db.execute(f'PRAGMA table_info({table})') as cursor:
+            columns = {row['name']: row['type'].upper() for row in await cursor.fetchall()}
+        
+        ts_columns = TIMESTAMP_COLUMNS[table]
+        if not columns or all(columns.get(col) == 'INTEGER' for col in ts_columns):
+            return
+        
+        select = ', '.join(
+            f"CAST(strftime('%s', {col}) AS INTEGER) * 1000000" if col in ts_columns else col
+            for col in columns
+        )
+        await db.execute('BEGIN')
+        await db.execute(f'ALTER TABLE {table} RENAME TO {table}_old')
+        await db.execute(SCHEMA[table])
+        await db.execute(
+            f"INSERT INTO {table} ({', '.join(columns)}) SELECT {select} FROM {table}_old"
+        )
+        await db.execute(f'DROP TABLE {table}_old')
+        await db.commit()
+        logger.info('Migrated %s timestamps to epoch microseconds', table)
+    
+    async def _add_missing_columns(self, db: aiosqlite.Connection, table: str):
+        """Add columns from ADDED_COLUMNS that an older database lacks."""
+        added = ADDED_COLUMNS.get(table)
+        if not added:
+            return
+        
+        async with db.execute(f'PRAGMA table_info({table})') as cursor:
+            existing = {row['name'] for row in await cursor.fetchall()}
+        for column, column_type in added.items():
+            if column not in existing:
+                await db.execute(f'ALTER TABLE {table} ADD COLUMN {column} {column_type}')
+                logger.info('Added column %s.%s', table, column)
     
     # ========================================================================
     # ECONOMY OPERATIONS
@@ -85,48 +256,80 @@ class Database(commands.Cog):
     
     async def add_economy(self, guild_id: int, guild_name: str, currency_name: str,
                          currency_symbol: str, rate_usd: float, applied_by: int,
-                         application_note: Optional[str] = None) -> bool:
-        """Add a new economy application."""
+                         application_note: Optional[str] = None,
+                         announcement_channel_id: Optional[int] = None,
+                         ts: Optional[int] = None) -> bool:
+        """Add a new economy application. Returns False if the guild already has one."""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                await db.execute('''
+            async with self.pool.connection() as db:
+                async with db.execute('''
                     INSERT INTO economies 
                     (guild_id, guild_name, currency_name, currency_symbol, 
-                     rate_usd, status, application_note, applied_by, applied_at)
-                    VALUES (?, ?, ?, ?, ?, 'pending', ?, ?, ?)
+                     rate_usd, status, application_note, applied_by, applied_at,
+                     announcement_channel_id)
+                    VALUES (?, ?, ?, ?, ?, 'pending', ?, ?, ?, ?)
+                    ON CONFLICT(guild_id) DO NOTHING
+                    RETURNING guild_id
                 ''', (guild_id, guild_name, currency_name, currency_symbol, 
-                      rate_usd, application_note, applied_by, datetime.utcnow().isoformat()))
+                      rate_usd, application_note, applied_by, ts or utc_now_us(),
+                      announcement_channel_id)) as cursor:
+                    inserted = await cursor.fetchone() is not None
                 await db.commit()
-                logger.info(f'Added economy application for guild {guild_id}')
+                if not inserted:
+                    logger.warning('Economy for guild %s already exists', guild_id)
+                    return False
+                self._econ_cache.pop(guild_id, None)
+                logger.info('Added economy application for guild %s', guild_id)
                 return True
-        except aiosqlite.IntegrityError:
-            logger.warning(f'Economy for guild {guild_id} already exists')
-            return False
         except Exception as e:
-            logger.error(f'Failed to add economy: {e}')
+            logger.error('Failed to add economy: %s', e)
             return False
     
     async def get_economy(self, guild_id: int) -> Optional[Dict[str, Any]]:
         """Get economy information for a specific guild."""
+        if guild_id in self._econ_cache:
+            self._econ_cache.move_to_end(guild_id)
+            row = self._econ_cache[guild_id]
+            return dict(row) if row else None
+        
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                db.row_factory = aiosqlite.Row
+            async with self.pool.connection() as db:
                 async with db.execute(
                     'SELECT * FROM economies WHERE guild_id = ?', (guild_id,)
                 ) as cursor:
                     row = await cursor.fetchone()
+            economy = dict(row) if row else None
+        except Exception as e:
+            logger.error('Failed to get economy: %s', e)
+            return None
+        
+        self._econ_cache[guild_id] = economy
+        if len(self._econ_cache) > self._econ_cache_size:
+            self._econ_cache.popitem(last=False)
+        return dict(economy) if economy else None
+    
+    async def get_economy_by_name(self, guild_name: str,
+                                  status: str = 'approved') -> Optional[Dict[str, Any]]:
+        """Get an economy by guild name (case-insensitive)."""
+        try:
+            async with self.pool.connection() as db:
+                async with db.execute('''
+                    SELECT * FROM economies
+                    WHERE guild_name = ? COLLATE NOCASE AND status = ?
+                    LIMIT 1
+                ''', (guild_name, status)) as cursor:
+                    row = await cursor.fetchone()
                     if row:
                         return dict(row)
                     return None
         except Exception as e:
-            logger.error(f'Failed to get economy: {e}')
+            logger.error('Failed to get economy by name: %s', e)
             return None
     
     async def get_all_economies(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get all economies, optionally filtered by status."""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                db.row_factory = aiosqlite.Row
+            async with self.pool.connection() as db:
                 if status:
                     query = 'SELECT * FROM economies WHERE status = ? ORDER BY applied_at DESC'
                     params = (status,)
@@ -138,41 +341,75 @@ class Database(commands.Cog):
                     rows = await cursor.fetchall()
                     return [dict(row) for row in rows]
         except Exception as e:
-            logger.error(f'Failed to get economies: {e}')
+            logger.error('Failed to get economies: %s', e)
             return []
     
+    async def get_economies_grouped(self, limit_per_status: int = 10,
+                                    status: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """Get the newest economies for each status, with per-status totals.
+        
+        Every row carries a ``total`` column holding the full count for its status.
+        """
+        grouped: Dict[str, List[Dict[str, Any]]] = {
+            'approved': [], 'pending': [], 'rejected': []
+        }
+        statuses = (status,) if status else tuple(grouped)
+        placeholders = ', '.join('?' for _ in statuses)
+        try:
+            async with self.pool.connection() as db:
+                async with db.execute(f'''
+                    SELECT status, guild_name, currency_name, currency_symbol, rate_usd, total
+                    FROM (
+                        SELECT status, guild_name, currency_name, currency_symbol, rate_usd,
+                               ROW_NUMBER() OVER (PARTITION BY status ORDER BY applied_at DESC) AS rn,
+                               COUNT(*) OVER (PARTITION BY status) AS total
+                        FROM economies
+                        WHERE status IN ({placeholders})
+                    )
+                    WHERE rn <= ?
+                    ORDER BY status, rn
+                ''', (*statuses, limit_per_status)) as cursor:
+                    async for row in cursor:
+                        grouped[row['status']].append(dict(row))
+            return grouped
+        except Exception as e:
+            logger.error('Failed to get grouped economies: %s', e)
+            return grouped
+    
     async def update_economy_status(self, guild_id: int, status: str, 
                                    approved_by: Optional[int] = None) -> bool:
         """Update the status of an economy (approved/rejected)."""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self.pool.connection() as db:
                 if status == 'approved' and approved_by:
                     await db.execute('''
                         UPDATE economies 
                         SET status = ?, approved_at = ?, approved_by = ?
                         WHERE guild_id = ?
-                    ''', (status, datetime.utcnow().isoformat(), approved_by, guild_id))
+                    ''', (status, utc_now_us(), approved_by, guild_id))
                 else:
                     await db.execute('''
                         UPDATE economies SET status = ? WHERE guild_id = ?
                     ''', (status, guild_id))
                 await db.commit()
-                logger.info(f'Updated economy {guild_id} status to {status}')
+                self._econ_cache.pop(guild_id, None)
+                logger.info('Updated economy %s status to %s', guild_id, status)
                 return True
         except Exception as e:
-            logger.error(f'Failed to update economy status: {e}')
+            logger.error('Failed to update economy status: %s', e)
             return False
     
     async def remove_economy(self, guild_id: int) -> bool:
         """Remove an economy from the database."""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self.pool.connection() as db:
                 await db.execute('DELETE FROM economies WHERE guild_id = ?', (guild_id,))
                 await db.commit()
-                logger.info(f'Removed economy {guild_id}')
+                self._econ_cache.pop(guild_id, None)
+                logger.info('Removed economy %s', guild_id)
                 return True
         except Exception as e:
-            logger.error(f'Failed to remove economy: {e}')
+            logger.error('Failed to remove economy: %s', e)
             return False
     
     # ========================================================================
@@ -182,31 +419,68 @@ class Database(commands.Cog):
     async def log_transfer(self, user_id: int, from_guild_id: int, to_guild_id: int,
                           amount_source: float, amount_target: float,
                           source_currency: str, target_currency: str,
-                          wallet_type: str, exchange_rate: float) -> bool:
+                          wallet_type: str, exchange_rate: float,
+                          ts: Optional[int] = None) -> bool:
         """Log a currency transfer."""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                await db.execute('''
-                    INSERT INTO transfers 
-                    (user_id, from_guild_id, to_guild_id, amount_source, 
-                     amount_target, source_currency, target_currency, 
-                     wallet_type, timestamp, exchange_rate)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (user_id, from_guild_id, to_guild_id, amount_source,
+            async with self.pool.connection() as db:
+                await db.execute(INSERT_TRANSFER_SQL, (user_id, from_guild_id, to_guild_id, amount_source,
+                      amount_target, source_currency, target_currency,
+                      wallet_type, ts or utc_now_us(), exchange_rate))
+                await db.commit()
+                logger.info('Logged transfer for user %s', user_id)
+                return True
+        except Exception as e:
+            logger.error('Failed to log transfer: %s', e)
+            return False
+    
+    async def log_transfer_with_action(self, user_id: int, from_guild_id: int, to_guild_id: int,
+                                       amount_source: float, amount_target: float,
+                                       source_currency: str, target_currency: str,
+                                       wallet_type: str, exchange_rate: float,
+                                       details: Optional[str] = None,
+                                       ts: Optional[int] = None) -> bool:
+        """Log a transfer and its 'transfer' audit entry in one transaction."""
+        ts = ts or utc_now_us()
+        try:
+            async with self.pool.connection() as db:
+                await db.execute(INSERT_TRANSFER_SQL, (user_id, from_guild_id, to_guild_id, amount_source,
                       amount_target, source_currency, target_currency,
-                      wallet_type, datetime.utcnow().isoformat(), exchange_rate))
+                      wallet_type, ts, exchange_rate))
+                await db.execute(INSERT_AUDIT_SQL, ('transfer', user_id, from_guild_id, details, ts))
+                await db.commit()
+                logger.info('Logged transfer for user %s', user_id)
+                return True
+        except Exception as e:
+            logger.error('Failed to log transfer: %s', e)
+            return False
+    
+    async def log_transfers_bulk(self, rows: List[tuple]) -> bool:
+        """Log many transfers in one transaction.
+        
+        Each row holds the same fields as log_transfer, in the same order:
+        (user_id, from_guild_id, to_guild_id, amount_source, amount_target,
+        source_currency, target_currency, wallet_type, exchange_rate).
+        """
+        if not rows:
+            return True
+        
+        timestamp = utc_now_us()
+        params = [(*row[:8], timestamp, row[8]) for row in rows]
+        try:
+            async with self.pool.connection() as db:
+                await db.executemany(INSERT_TRANSFER_SQL, params)
                 await db.commit()
-                logger.info(f'Logged transfer for user {user_id}')
+                logger.info('Logged %s transfers', len(params))
                 return True
         except Exception as e:
-            logger.error(f'Failed to log transfer: {e}')
+            logger.error('Failed to log transfers: %s', e)
             return False
     
     async def get_user_transfers(self, user_id: int, limit: int = 10) -> List[Dict[str, Any]]:
         """Get recent transfers for a user."""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                db.row_factory = aiosqlite.Row
+            async with self.pool.connection() as db:
                 async with db.execute('''
                     SELECT * FROM transfers 
                     WHERE user_id = ? 
@@ -216,102 +490,180 @@ class Database(commands.Cog):
                     rows = await cursor.fetchall()
                     return [dict(row) for row in rows]
         except Exception as e:
-            logger.error(f'Failed to get user transfers: {e}')
+            logger.error('Failed to get user transfers: %s', e)
             return []
     
     async def cleanup_old_transfers(self, days: int = 180) -> int:
         """Delete transfers older than specified days."""
         try:
-            cutoff_date = (datetime.utcnow() - timedelta(days=days)).isoformat()
-            async with aiosqlite.connect(self.db_path) as db:
+            cutoff_date = utc_now_us() - days * 86_400_000_000
+            async with self.pool.connection() as db:
                 cursor = await db.execute(
                     'DELETE FROM transfers WHERE timestamp < ?', (cutoff_date,)
                 )
                 deleted = cursor.rowcount
                 await db.commit()
-                logger.info(f'Cleaned up {deleted} old transfers')
+                logger.info('Cleaned up %s old transfers', deleted)
                 return deleted
         except Exception as e:
-            logger.error(f'Failed to cleanup transfers: {e}')
+            logger.error('Failed to cleanup transfers: %s', e)
             return 0
     
     # ========================================================================
     # OFFICER OPERATIONS
     # ========================================================================
     
-    async def add_officer(self, user_id: int, added_by: int) -> bool:
+    async def add_officer(self, user_id: int, added_by: int,
+                          ts: Optional[int] = None) -> bool:
         """Add an approved officer."""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self.pool.connection() as db:
                 await db.execute('''
                     INSERT INTO approved_officers (user_id, added_at, added_by)
                     VALUES (?, ?, ?)
-                ''', (user_id, datetime.utcnow().isoformat(), added_by))
+                ''', (user_id, ts or utc_now_us(), added_by))
                 await db.commit()
-                logger.info(f'Added officer {user_id}')
+                if self._officers is not None:
+                    self._officers.add(user_id)
+                logger.info('Added officer %s', user_id)
                 return True
         except aiosqlite.IntegrityError:
-            logger.warning(f'Officer {user_id} already exists')
+            logger.warning('Officer %s already exists', user_id)
             return False
         except Exception as e:
-            logger.error(f'Failed to add officer: {e}')
+            logger.error('Failed to add officer: %s', e)
             return False
     
+    async def add_officers_bulk(self, rows: List[Tuple[int, int]],
+                                ts: Optional[int] = None) -> int:
+        """Add many officers from (user_id, added_by) pairs in one transaction.
+        
+        Existing officers are skipped. Returns the number of rows inserted.
+        """
+        if not rows:
+            return 0
+        
+        ts = ts or utc_now_us()
+        inserted = 0
+        try:
+            async with self.pool.connection() as db:
+                # 300 rows x 3 params keeps each statement under SQLite's 999-variable limit
+                for i in range(0, len(rows), 300):
+                    chunk = rows[i:i + 300]
+                    placeholders = ', '.join(['(?, ?, ?)'] * len(chunk))
+                    params = list(chain.from_iterable((uid, ts, by) for uid, by in chunk))
+                    cursor = await db.execute(
+                        f'INSERT OR IGNORE INTO approved_officers (user_id, added_at, added_by) '
+                        f'VALUES {placeholders}',
+                        params
+                    )
+                    inserted += cursor.rowcount
+                await db.commit()
+            if self._officers is not None:
+                self._officers.update(uid for uid, _ in rows)
+            logger.info('Added %s officers in bulk', inserted)
+            return inserted
+        except Exception as e:
+            logger.error('Failed to add officers: %s', e)
+            return 0
+    
     async def remove_officer(self, user_id: int) -> bool:
         """Remove an approved officer."""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self.pool.connection() as db:
                 await db.execute('DELETE FROM approved_officers WHERE user_id = ?', (user_id,))
                 await db.commit()
-                logger.info(f'Removed officer {user_id}')
+                if self._officers is not None:
+                    self._officers.discard(user_id)
+                logger.info('Removed officer %s', user_id)
                 return True
         except Exception as e:
-            logger.error(f'Failed to remove officer: {e}')
+            logger.error('Failed to remove officer: %s', e)
             return False
     
     async def is_officer(self, user_id: int) -> bool:
         """Check if a user is an approved officer."""
+        if self._officers is not None:
+            return user_id in self._officers
+        
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self.pool.connection() as db:
                 async with db.execute(
-                    'SELECT 1 FROM approved_officers WHERE user_id = ?', (user_id,)
+                    'SELECT EXISTS(SELECT 1 FROM approved_officers WHERE user_id = ?)', (user_id,)
                 ) as cursor:
-                    result = await cursor.fetchone()
-                    return result is not None
+                    row = await cursor.fetchone()
+                    return bool(row[0])
         except Exception as e:
-            logger.error(f'Failed to check officer status: {e}')
+            logger.error('Failed to check officer status: %s', e)
             return False
     
     async def get_all_officers(self) -> List[Dict[str, Any]]:
         """Get all approved officers."""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                db.row_factory = aiosqlite.Row
+            async with self.pool.connection() as db:
                 async with db.execute('SELECT * FROM approved_officers') as cursor:
                     rows = await cursor.fetchall()
                     return [dict(row) for row in rows]
         except Exception as e:
-            logger.error(f'Failed to get officers: {e}')
+            logger.error('Failed to get officers: %s', e)
             return []
     
+    async def reload_officers(self):
+        """Reload the in-memory officer set from the database."""
+        try:
+            async with self.pool.connection() as db:
+                async with db.execute('SELECT user_id FROM approved_officers') as cursor:
+                    rows = await cursor.fetchall()
+            self._officers = {row['user_id'] for row in rows}
+            logger.info('Loaded %s officers', len(self._officers))
+        except Exception as e:
+            logger.error('Failed to load officers: %s', e)
+    
     # ========================================================================
     # AUDIT LOG
     # ========================================================================
     
     async def log_action(self, action: str, user_id: int, 
-                        guild_id: Optional[int] = None, details: Optional[str] = None) -> bool:
-        """Log an action to the audit log."""
+                        guild_id: Optional[int] = None, details: Optional[str] = None,
+                        ts: Optional[int] = None) -> bool:
+        """Queue an action for the audit log. Rows are written in batches."""
+        self._audit_q.put_nowait(
+            (action, user_id, guild_id, details, ts or utc_now_us())
+        )
+        return True
+    
+    async def _flush_audit(self, max_batch: int = 500, interval: float = 0.25):
+        """Background writer that batches queued audit rows."""
+        rows: List[tuple] = []
+        write: Optional[asyncio.Task] = None
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                await db.execute('''
-                    INSERT INTO audit_log (action, user_id, guild_id, details, timestamp)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (action, user_id, guild_id, details, datetime.utcnow().isoformat()))
+            while True:
+                rows.append(await self._audit_q.get())
+                await asyncio.sleep(interval)
+                while len(rows) < max_batch and not self._audit_q.empty():
+                    rows.append(self._audit_q.get_nowait())
+                batch, rows = rows, []
+                # Shielded so a shutdown mid-write doesn't drop the batch being written
+                write = asyncio.create_task(self._write_audit_rows(batch))
+                await asyncio.shield(write)
+        except asyncio.CancelledError:
+            # Shutdown: finish the current batch, then write whatever is still queued
+            if write is not None and not write.done():
+                await write
+            while not self._audit_q.empty():
+                rows.append(self._audit_q.get_nowait())
+            if rows:
+                await self._write_audit_rows(rows)
+            raise
+    
+    async def _write_audit_rows(self, rows: List[tuple]):
+        """Insert a batch of audit rows in a single transaction."""
+        try:
+            async with self.pool.connection() as db:
+                await db.executemany(INSERT_AUDIT_SQL, rows)
                 await db.commit()
-                return True
         except Exception as e:
-            logger.error(f'Failed to log action: {e}')
-            return False
+            logger.error('Failed to write %s audit log entries: %s', len(rows), e)
 
 async def setup(bot):
     await bot.add_cog(Database(bot))
@@ -2,16 +2,26 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 import logging
+from itertools import islice
 from typing import Optional, List
 import re
 
 logger = logging.getLogger('BankerBot.Economy')
 
+# Optin field limits, compiled once and checked with fullmatch
+_CURRENCY_NAME_RE = re.compile(r'.{1,50}', re.DOTALL)
+_SYMBOL_RE = re.compile(r'.{1,10}', re.DOTALL)
+
 class EconomyCommands(commands.Cog):
     """Main economy commands for BankerBot."""
     
     def __init__(self, bot):
         self.bot = bot
+        # Route approve/reject clicks on any application, including ones sent before a restart
+        bot.add_dynamic_items(ApprovalButton)
+    
+    async def cog_unload(self):
+        self.bot.remove_dynamic_items(ApprovalButton)
     
     def get_db(self):
         """Get database cog."""
@@ -48,62 +58,41 @@ class EconomyCommands(commands.Cog):
         note: Optional[str] = None
     ):
         """Apply for your server to join the global economy."""
-        await interaction.response.defer(ephemeral=True)
-        
-        db = self.get_db()
-        unb = self.get_unb()
-        
-        if not db or not unb:
-            await interaction.followup.send(
-                "❌ Bot services not available. Please try again later.",
-                ephemeral=True
-            )
-            return
-        
-        # Validate inputs
+        # Validate inputs before deferring so bad input gets an immediate reply
         min_rate = self.bot.config['min_exchange_rate']
         max_rate = self.bot.config['max_exchange_rate']
         
         if rate_usd < min_rate or rate_usd > max_rate:
-            await interaction.followup.send(
+            await interaction.response.send_message(
                 f"❌ Exchange rate must be between {min_rate} and {max_rate}",
                 ephemeral=True
             )
             return
         
-        if len(currency_name) > 50:
-            await interaction.followup.send(
+        if not _CURRENCY_NAME_RE.fullmatch(currency_name):
+            await interaction.response.send_message(
                 "❌ Currency name must be 50 characters or less",
                 ephemeral=True
             )
             return
         
-        if len(currency_symbol) > 10:
-            await interaction.followup.send(
+        if not _SYMBOL_RE.fullmatch(currency_symbol):
+            await interaction.response.send_message(
                 "❌ Currency symbol must be 10 characters or less",
                 ephemeral=True
             )
             return
         
-        # Check if server already applied
-        existing = await db.get_economy(interaction.guild_id)
-        if existing:
-            status = existing['status']
-            if status == 'approved':
-                await interaction.followup.send(
-                    "✅ Your server is already part of the global economy!",
-                    ephemeral=True
-                )
-            elif status == 'pending':
-                await interaction.followup.send(
-                    "⏳ Your application is pending review.",
-                    ephemeral=True
-                )
-            elif status == 'rejected':
-                await interaction.followup.send(
-                    "❌ Your previous application was rejected. Please contact a World Bank Officer.",
-                    ephemeral=True
-                )
+        await interaction.response.defer(ephemeral=True)
+        
+        db = self.get_db()
+        unb = self.get_unb()
+        
+        if not db or not unb:
+            await interaction.followup.send(
+                "❌ Bot services not available. Please try again later.",
+                ephemeral=True
+            )
             return
         
         # Validate UnbelievaBoat API access
@@ -119,7 +108,7 @@ class EconomyCommands(commands.Cog):
             )
             return
         
-        # Add to database
+        # Add to database; a conflict means this server already applied
         success = await db.add_economy(
             interaction.guild_id,
             interaction.guild.name,
@@ -127,56 +116,92 @@ class EconomyCommands(commands.Cog):
             currency_symbol,
             rate_usd,
             interaction.user.id,
-            note
+            note,
+            announcement_channel_id=interaction.channel_id
         )
         
         if not success:
-            await interaction.followup.send(
-                "❌ Failed to submit application. Please try again.",
-                ephemeral=True
-            )
+            existing = await db.get_economy(interaction.guild_id)
+            if not existing:
+                await interaction.followup.send(
+                    "❌ Failed to submit application. Please try again.",
+                    ephemeral=True
+                )
+                return
+            
+            status = existing['status']
+            if status == 'approved':
+                await interaction.followup.send(
+                    "✅ Your server is already part of the global economy!",
+                    ephemeral=True
+                )
+            elif status == 'pending':
+                await interaction.followup.send(
+                    "⏳ Your application is pending review.",
+                    ephemeral=True
+                )
+            elif status == 'rejected':
+                await interaction.followup.send(
+                    "❌ Your previous application was rejected. Please contact a World Bank Officer.",
+                    ephemeral=True
+                )
             return
         
-        # Log action
+        await interaction.followup.send(
+            "✅ **Application Submitted!**\n\n"
+            "Your server's application to join the global economy has been submitted.\n"
+            "A World Bank Officer will review it shortly.\n\n"
+            f"**Currency:** {currency_symbol} {currency_name}\n"
+            f"**Exchange Rate:** 1 USD = {rate_usd} {currency_symbol}",
+            ephemeral=True
+        )
+        
+        # Audit log and approval message are not needed for the user's acknowledgement
         await db.log_action(
             'economy_optin',
             interaction.user.id,
             interaction.guild_id,
             f"Currency: {currency_name}, Rate: {rate_usd}, Symbol: {currency_symbol}"
         )
-        
-        # Send to approval channel
+        self.bot.spawn(self._send_approval_embed(
+            interaction.guild_id,
+            interaction.guild.name,
+            interaction.user,
+            currency_name,
+            currency_symbol,
+            rate_usd,
+            note
+        ))
+    
+    async def _send_approval_embed(self, guild_id: int, guild_name: str, applicant: discord.abc.User,
+                                   currency_name: str, currency_symbol: str, rate_usd: float,
+                                   note: Optional[str]):
+        """Post a new application to the Central Bank approval channel."""
         try:
             central_bank = self.bot.get_guild(self.bot.config['central_bank_server_id'])
             if central_bank:
                 approval_channel = central_bank.get_channel(self.bot.config['approval_channel_id'])
                 if approval_channel:
-                    embed = discord.Embed(
-                        title="🏦 New Economy Application",
-                        color=discord.Color.blue(),
-                        timestamp=discord.utils.utcnow()
-                    )
-                    embed.add_field(name="Server", value=interaction.guild.name, inline=True)
-                    embed.add_field(name="Server ID", value=str(interaction.guild_id), inline=True)
-                    embed.add_field(name="Applied By", value=f"{interaction.user.mention} ({interaction.user.id})", inline=False)
-                    embed.add_field(name="Currency", value=f"{currency_symbol} {currency_name}", inline=True)
-                    embed.add_field(name="Rate (USD)", value=f"1 USD = {rate_usd} {currency_symbol}", inline=True)
+                    fields = [
+                        {"name": "Server", "value": guild_name, "inline": True},
+                        {"name": "Server ID", "value": str(guild_id), "inline": True},
+                        {"name": "Applied By", "value": f"{applicant.mention} ({applicant.id})", "inline": False},
+                        {"name": "Currency", "value": f"{currency_symbol} {currency_name}", "inline": True},
+                        {"name": "Rate (USD)", "value": f"1 USD = {rate_usd} {currency_symbol}", "inline": True},
+                    ]
                     if note:
-                        embed.add_field(name="Note", value=note, inline=False)
+                        fields.append({"name": "Note", "value": note, "inline": False})
+                    embed = discord.Embed.from_dict({
+                        "title": "🏦 New Economy Application",
+                        "color": discord.Color.blue().value,
+                        "timestamp": discord.utils.utcnow().isoformat(),
+                        "fields": fields,
+                    })
                     
-                    view = ApprovalView(self.bot, interaction.guild_id)
+                    view = ApprovalView(guild_id)
                     await approval_channel.send(embed=embed, view=view)
         except Exception as e:
-            logger.error(f'Failed to send approval message: {e}')
-        
-        await interaction.followup.send(
-            "✅ **Application Submitted!**\n\n"
-            "Your server's application to join the global economy has been submitted.\n"
-            "A World Bank Officer will review it shortly.\n\n"
-            f"**Currency:** {currency_symbol} {currency_name}\n"
-            f"**Exchange Rate:** 1 USD = {rate_usd} {currency_symbol}",
-            ephemeral=True
-        )
+            logger.error('Failed to send approval message: %s', e)
     
     # ========================================================================
     # LIST COMMAND
@@ -205,60 +230,63 @@ class EconomyCommands(commands.Cog):
             )
             return
         
-        economies = await db.get_all_economies(status.lower() if status else None)
+        grouped = await db.get_economies_grouped(10, status.lower() if status else None)
         
-        if not economies:
+        if not any(grouped.values()):
             await interaction.followup.send("No economies found.")
             return
         
-        # Group by status
-        approved = [e for e in economies if e['status'] == 'approved']
-        pending = [e for e in economies if e['status'] == 'pending']
-        rejected = [e for e in economies if e['status'] == 'rejected']
+        approved = grouped['approved']
+        pending = grouped['pending']
+        rejected = grouped['rejected']
+        totals = {key: rows[0]['total'] if rows else 0 for key, rows in grouped.items()}
         
-        embed = discord.Embed(
-            title="🌍 Global Economy List",
-            color=discord.Color.green(),
-            timestamp=discord.utils.utcnow()
-        )
+        fields = []
         
         if not status or status.lower() == 'approved':
             if approved:
-                approved_text = "\n".join([
+                approved_text = "\n".join(
                     f"**{e['guild_name']}**\n"
                     f"└ {e['currency_symbol']} {e['currency_name']} "
                     f"(1 USD = {e['rate_usd']} {e['currency_symbol']})"
-                    for e in approved[:10]
-                ])
-                embed.add_field(
-                    name=f"✅ Approved ({len(approved)})",
-                    value=approved_text if len(approved) <= 10 else approved_text + f"\n*...and {len(approved) - 10} more*",
-                    inline=False
+                    for e in islice(approved, 10)
                 )
+                fields.append({
+                    "name": f"✅ Approved ({totals['approved']})",
+                    "value": approved_text if totals['approved'] <= 10 else approved_text + f"\n*...and {totals['approved'] - 10} more*",
+                    "inline": False
+                })
         
         if not status or status.lower() == 'pending':
             if pending:
-                pending_text = "\n".join([
+                pending_text = "\n".join(
                     f"**{e['guild_name']}** - {e['currency_symbol']} {e['currency_name']}"
-                    for e in pending[:5]
-                ])
-                embed.add_field(
-                    name=f"⏳ Pending ({len(pending)})",
-                    value=pending_text if len(pending) <= 5 else pending_text + f"\n*...and {len(pending) - 5} more*",
-                    inline=False
+                    for e in islice(pending, 5)
                 )
+                fields.append({
+                    "name": f"⏳ Pending ({totals['pending']})",
+                    "value": pending_text if totals['pending'] <= 5 else pending_text + f"\n*...and {totals['pending'] - 5} more*",
+                    "inline": False
+                })
         
         if not status or status.lower() == 'rejected':
             if rejected:
-                rejected_text = "\n".join([
+                rejected_text = "\n".join(
                     f"**{e['guild_name']}** - {e['currency_symbol']} {e['currency_name']}"
-                    for e in rejected[:5]
-                ])
-                embed.add_field(
-                    name=f"❌ Rejected ({len(rejected)})",
-                    value=rejected_text if len(rejected) <= 5 else rejected_text + f"\n*...and {len(rejected) - 5} more*",
-                    inline=False
+                    for e in islice(rejected, 5)
                 )
+                fields.append({
+                    "name": f"❌ Rejected ({totals['rejected']})",
+                    "value": rejected_text if totals['rejected'] <= 5 else rejected_text + f"\n*...and {totals['rejected'] - 5} more*",
+                    "inline": False
+                })
+        
+        embed = discord.Embed.from_dict({
+            "title": "🌍 Global Economy List",
+            "color": discord.Color.green().value,
+            "timestamp": discord.utils.utcnow().isoformat(),
+            "fields": fields,
+        })
         
         await interaction.followup.send(embed=embed)
     
@@ -299,43 +327,83 @@ class EconomyCommands(commands.Cog):
 async def setup(bot):
     await bot.add_cog(EconomyCommands(bot))
 
+async def refresh_economy_caches(bot):
+    """Tell cogs that cache economy lists that the economies table changed."""
+    admin = bot.get_cog('AdminCommands')
+    if admin:
+        await admin.refresh_economy_cache()
+    
+    transfer = bot.get_cog('TransferCommands')
+    if transfer:
+        transfer.invalidate_economy_cache()
+    
+    broadcast = bot.get_cog('BroadcastSystem')
+    if broadcast:
+        broadcast.invalidate_economy_cache()
+
 # ============================================================================
 # VIEWS AND BUTTONS
 # ============================================================================
 
-class ApprovalView(discord.ui.View):
-    """View for approving/rejecting economy applications."""
+class ApprovalButton(discord.ui.DynamicItem[discord.ui.Button],
+                     template=r'(?P<action>approve|reject):(?P<guild_id>[0-9]+)'):
+    """Approve/reject button that carries the applicant guild in its custom_id.
     
-    def __init__(self, bot, guild_id: int):
-        super().__init__(timeout=None)
-        self.bot = bot
+    Registered once with bot.add_dynamic_items, so buttons on any application
+    keep working after a restart without keeping a view per application.
+    """
+    
+    def __init__(self, action: str, guild_id: int):
+        if action == 'approve':
+            button = discord.ui.Button(
+                label="Approve ✅", style=discord.ButtonStyle.green, custom_id=f"approve:{guild_id}"
+            )
+        else:
+            button = discord.ui.Button(
+                label="Reject ❌", style=discord.ButtonStyle.red, custom_id=f"reject:{guild_id}"
+            )
+        super().__init__(button)
+        self.action = action
         self.guild_id = guild_id
     
-    @discord.ui.button(label="Approve ✅", style=discord.ButtonStyle.green, custom_id="approve")
-    async def approve_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        db = self.bot.get_cog('Database')
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(match['action'], int(match['guild_id']))
+    
+    async def callback(self, interaction: discord.Interaction):
+        if self.action == 'approve':
+            await self.approve(interaction)
+        else:
+            await self.reject(interaction)
+    
+    async def approve(self, interaction: discord.Interaction):
+        # Acknowledge first so a slow check cannot miss Discord's 3 second window
+        await interaction.response.defer()
+        
+        bot = interaction.client
+        db = bot.get_cog('Database')
         if not db:
-            await interaction.response.send_message("❌ Database not available.", ephemeral=True)
+            await interaction.followup.send("❌ Database not available.", ephemeral=True)
             return
         
         # Check if user is an officer
         if not await db.is_officer(interaction.user.id):
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 "❌ You are not authorized to approve applications.",
                 ephemeral=True
             )
             return
         
-        await interaction.response.defer()
-        
         # Update status
         success = await db.update_economy_status(self.guild_id, 'approved', interaction.user.id)
         
         if success:
             await db.log_action('economy_approved', interaction.user.id, self.guild_id)
             
+            await refresh_economy_caches(bot)
+            
             # Update message
-            embed = interaction.message.embeds[0]
+            embed = interaction.message.embeds[0].copy()
             embed.color = discord.Color.green()
             embed.add_field(
                 name="Status",
@@ -343,60 +411,63 @@ class ApprovalView(discord.ui.View):
                 inline=False
             )
             
-            # Disable buttons
-            for item in self.children:
-                item.disabled = True
-            
-            await interaction.message.edit(embed=embed, view=self)
+            # The decision is final, so drop the buttons entirely
+            await interaction.message.edit(embed=embed, view=None)
             await interaction.followup.send("✅ Application approved!")
             
-            # Notify the guild
-            try:
-                guild = self.bot.get_guild(self.guild_id)
-                if guild:
-                    economy = await db.get_economy(self.guild_id)
-                    # Try to find a channel to send notification
-                    # You might want to store the channel ID during application
-                    for channel in guild.text_channels:
-                        if channel.permissions_for(guild.me).send_messages:
-                            await channel.send(
-                                f"🎉 **Welcome to the Global Economy!**\n\n"
-                                f"Your application has been approved!\n"
-                                f"Currency: {economy['currency_symbol']} {economy['currency_name']}\n"
-                                f"Exchange Rate: 1 USD = {economy['rate_usd']} {economy['currency_symbol']}\n\n"
-                                f"Users can now transfer funds using `/economy transfer`"
-                            )
-                            break
-            except Exception as e:
-                logger.error(f'Failed to notify guild: {e}')
+            # Announce in the background so the approver isn't kept waiting on it
+            bot.spawn(self._notify_guild(bot, db))
         else:
             await interaction.followup.send("❌ Failed to approve application.")
     
-    @discord.ui.button(label="Reject ❌", style=discord.ButtonStyle.red, custom_id="reject")
-    async def reject_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        db = self.bot.get_cog('Database')
+    async def _notify_guild(self, bot, db):
+        """Tell the approved guild it has joined the global economy."""
+        try:
+            guild = bot.get_guild(self.guild_id)
+            if guild:
+                economy = await db.get_economy(self.guild_id)
+                # Announce where the application was made, else the system channel
+                channel = guild.get_channel(economy.get('announcement_channel_id') or 0)
+                if not isinstance(channel, discord.TextChannel):
+                    channel = guild.system_channel
+                if channel and channel.permissions_for(guild.me).send_messages:
+                    await channel.send(
+                        f"🎉 **Welcome to the Global Economy!**\n\n"
+                        f"Your application has been approved!\n"
+                        f"Currency: {economy['currency_symbol']} {economy['currency_name']}\n"
+                        f"Exchange Rate: 1 USD = {economy['rate_usd']} {economy['currency_symbol']}\n\n"
+                        f"Users can now transfer funds using `/economy transfer`"
+                    )
+        except Exception as e:
+            logger.error('Failed to notify guild: %s', e)
+    
+    async def reject(self, interaction: discord.Interaction):
+        # Acknowledge first so a slow check cannot miss Discord's 3 second window
+        await interaction.response.defer()
+        
+        bot = interaction.client
+        db = bot.get_cog('Database')
         if not db:
-            await interaction.response.send_message("❌ Database not available.", ephemeral=True)
+            await interaction.followup.send("❌ Database not available.", ephemeral=True)
             return
         
         # Check if user is an officer
         if not await db.is_officer(interaction.user.id):
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 "❌ You are not authorized to reject applications.",
                 ephemeral=True
             )
             return
         
-        await interaction.response.defer()
-        
         # Update status
         success = await db.update_economy_status(self.guild_id, 'rejected')
         
         if success:
             await db.log_action('economy_rejected', interaction.user.id, self.guild_id)
+            await refresh_economy_caches(bot)
             
             # Update message
-            embed = interaction.message.embeds[0]
+            embed = interaction.message.embeds[0].copy()
             embed.color = discord.Color.red()
             embed.add_field(
                 name="Status",
@@ -404,15 +475,20 @@ class ApprovalView(discord.ui.View):
                 inline=False
             )
             
-            # Disable buttons
-            for item in self.children:
-                item.disabled = True
-            
-            await interaction.message.edit(embed=embed, view=self)
+            # The decision is final, so drop the buttons entirely
+            await interaction.message.edit(embed=embed, view=None)
             await interaction.followup.send("❌ Application rejected.")
         else:
             await interaction.followup.send("❌ Failed to reject application.")
 
+class ApprovalView(discord.ui.View):
+    """Approve/reject buttons attached to a new economy application."""
+    
+    def __init__(self, guild_id: int):
+        super().__init__(timeout=None)
+        self.add_item(ApprovalButton('approve', guild_id))
+        self.add_item(ApprovalButton('reject', guild_id))
+
 class ConfirmWithdrawView(discord.ui.View):
     """View for confirming economy withdrawal."""
     
@@ -424,20 +500,23 @@ class ConfirmWithdrawView(discord.ui.View):
     
     @discord.ui.button(label="Confirm Withdrawal", style=discord.ButtonStyle.danger)
     async def confirm(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await interaction.response.defer()
+        
         if interaction.user.id != self.user_id:
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 "❌ Only the person who initiated this can confirm.",
                 ephemeral=True
             )
             return
         
-        await interaction.response.defer()
-        
         db = self.bot.get_cog('Database')
         success = await db.remove_economy(self.guild_id)
         
         if success:
             await db.log_action('economy_withdraw', interaction.user.id, self.guild_id)
+            
+            await refresh_economy_caches(self.bot)
+            
             await interaction.followup.send(
                 "✅ Your server has been withdrawn from the global economy.",
                 ephemeral=True
@@ -1,16 +1,54 @@
 import discord
 from discord import app_commands
-from discord.ext import commands
+from discord.ext import commands, tasks
 import logging
-from typing import List
+import asyncio
+import time
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import List, Dict, Optional, Tuple
+from uuid import uuid4
 
 logger = logging.getLogger('BankerBot.Transfer')
 
+# Seconds a transfer can wait for confirmation
+PENDING_TRANSFER_TTL = 120
+
+@dataclass(slots=True)
+class PendingTransfer:
+    """A quoted transfer waiting for the user to confirm it."""
+    user_id: int
+    source_economy: Dict
+    target_economy: Dict
+    amount: float
+    target_amount: float
+    wallet_type: str
+    exchange_rate: float
+    created_at: float = field(default_factory=time.monotonic)
+
 class TransferCommands(commands.Cog):
     """Currency transfer commands."""
     
     def __init__(self, bot):
         self.bot = bot
+        self._econ_cache: Optional[Tuple[float, List[Dict], Dict[str, Dict]]] = None
+        self._econ_ttl = 60.0
+        self._econ_stale: Tuple[List[Dict], Dict[str, Dict]] = ([], {})
+        self.pending_transfers: Dict[str, PendingTransfer] = {}
+    
+    async def cog_load(self):
+        self._sweep_pending.start()
+    
+    async def cog_unload(self):
+        self._sweep_pending.cancel()
+    
+    @tasks.loop(seconds=60)
+    async def _sweep_pending(self):
+        """Drop quotes whose confirmation window has passed."""
+        cutoff = time.monotonic() - PENDING_TRANSFER_TTL
+        expired = [token for token, p in self.pending_transfers.items() if p.created_at < cutoff]
+        for token in expired:
+            del self.pending_transfers[token]
     
     def get_db(self):
         return self.bot.get_cog('Database')
@@ -18,6 +56,39 @@ class TransferCommands(commands.Cog):
     def get_unb(self):
         return self.bot.get_cog('UnbelievaBoat')
     
+    def invalidate_economy_cache(self):
+        """Drop cached approved economies after an approval, rejection or removal."""
+        self._econ_cache = None
+    
+    async def _get_approved(self) -> Tuple[List[Dict], Dict[str, Dict]]:
+        """Approved economies and a casefolded-name index, cached for up to _econ_ttl seconds."""
+        now = time.monotonic()
+        if self._econ_cache and now < self._econ_cache[0]:
+            return self._econ_cache[1], self._econ_cache[2]
+        
+        db = self.get_db()
+        if not db:
+            return [], {}
+        economies = await db.get_all_economies('approved')
+        for e in economies:
+            e['guild_name_cf'] = e['guild_name'].casefold()
+        index = {e['guild_name_cf']: e for e in economies}
+        self._econ_cache = (now + self._econ_ttl, economies, index)
+        self._econ_stale = (economies, index)
+        return economies, index
+    
+    async def _get_approved_within(self, timeout: float = 2.5) -> Tuple[List[Dict], Dict[str, Dict]]:
+        """Like _get_approved, but falls back to the last known list if the fetch is slow.
+        
+        Autocomplete cannot defer, so it must answer inside Discord's 3 second window.
+        The fetch is shielded so that it still fills the cache for the next keystroke.
+        """
+        try:
+            return await asyncio.wait_for(asyncio.shield(self._get_approved()), timeout)
+        except asyncio.TimeoutError:
+            logger.warning('Economy lookup timed out, using last known list for autocomplete')
+            return self._econ_stale
+    
     # ========================================================================
     # TRANSFER COMMAND
     # ========================================================================
@@ -38,22 +109,10 @@ class TransferCommands(commands.Cog):
         wallet_type: str
     ):
         """Transfer currency between approved economies."""
-        await interaction.response.defer(ephemeral=True)
-        
-        db = self.get_db()
-        unb = self.get_unb()
-        
-        if not db or not unb:
-            await interaction.followup.send(
-                "❌ Bot services not available.",
-                ephemeral=True
-            )
-            return
-        
         # Validate wallet type
         wallet_type = wallet_type.lower()
         if wallet_type not in ['cash', 'bank']:
-            await interaction.followup.send(
+            await interaction.response.send_message(
                 "❌ Invalid wallet type. Use 'cash' or 'bank'.",
                 ephemeral=True
             )
@@ -64,24 +123,29 @@ class TransferCommands(commands.Cog):
         max_amount = self.bot.config['max_transfer_amount']
         
         if amount < min_amount or amount > max_amount:
-            await interaction.followup.send(
+            await interaction.response.send_message(
                 f"❌ Transfer amount must be between {min_amount} and {max_amount}.",
                 ephemeral=True
             )
             return
         
-        # Get all approved economies
-        economies = await db.get_all_economies('approved')
+        # Only defer once the slower lookups are about to start
+        await interaction.response.defer(ephemeral=True)
         
-        # Find source and target economies (by name, case-insensitive)
-        source_economy = None
-        target_economy = None
+        db = self.get_db()
+        unb = self.get_unb()
         
-        for economy in economies:
-            if economy['guild_name'].lower() == source_server.lower():
-                source_economy = economy
-            if economy['guild_name'].lower() == target_server.lower():
-                target_economy = economy
+        if not db or not unb:
+            await interaction.followup.send(
+                "❌ Bot services not available.",
+                ephemeral=True
+            )
+            return
+        
+        # Find source and target economies (by name, case-insensitive)
+        _, index = await self._get_approved()
+        source_economy = index.get(source_server.casefold())
+        target_economy = index.get(target_server.casefold())
         
         if not source_economy:
             await interaction.followup.send(
@@ -123,9 +187,9 @@ class TransferCommands(commands.Cog):
             return
         
         # Calculate conversion
-        # Convert source currency to USD, then USD to target currency
-        amount_usd = amount / source_economy['rate_usd']
-        target_amount = amount_usd * target_economy['rate_usd']
+        # Source -> USD -> target collapses to a single cross rate
+        exchange_rate = target_economy['rate_usd'] / source_economy['rate_usd']
+        target_amount = amount * exchange_rate
         
         # Confirmation
         embed = discord.Embed(
@@ -156,19 +220,21 @@ class TransferCommands(commands.Cog):
         )
         embed.add_field(
             name="Exchange Rate",
-            value=f"1 {source_economy['currency_symbol']} = {target_economy['rate_usd'] / source_economy['rate_usd']:.4f} {target_economy['currency_symbol']}",
+            value=f"1 {source_economy['currency_symbol']} = {exchange_rate:.4f} {target_economy['currency_symbol']}",
             inline=True
         )
         
-        view = ConfirmTransferView(
-            self.bot,
+        token = uuid4().hex
+        self.pending_transfers[token] = PendingTransfer(
             interaction.user.id,
             source_economy,
             target_economy,
             amount,
             target_amount,
-            wallet_type
+            wallet_type,
+            exchange_rate
         )
+        view = ConfirmTransferView(self, token, interaction.user.id)
         
         await interaction.followup.send(embed=embed, view=view, ephemeral=True)
     
@@ -179,18 +245,15 @@ class TransferCommands(commands.Cog):
         current: str
     ) -> List[app_commands.Choice[str]]:
         """Autocomplete for source server."""
-        db = self.get_db()
-        if not db:
-            return []
-        
-        economies = await db.get_all_economies('approved')
+        economies, _ = await self._get_approved_within()
         
         # Filter by current input
-        filtered = [e for e in economies if current.lower() in e['guild_name'].lower()]
+        current_cf = current.casefold()
+        filtered = (e for e in economies if current_cf in e['guild_name_cf'])
         
         return [
             app_commands.Choice(name=e['guild_name'], value=e['guild_name'])
-            for e in filtered[:25]
+            for e in islice(filtered, 25)
         ]
     
     @transfer.autocomplete('target_server')
@@ -200,18 +263,15 @@ class TransferCommands(commands.Cog):
         current: str
     ) -> List[app_commands.Choice[str]]:
         """Autocomplete for target server."""
-        db = self.get_db()
-        if not db:
-            return []
-        
-        economies = await db.get_all_economies('approved')
+        economies, _ = await self._get_approved_within()
         
         # Filter by current input
-        filtered = [e for e in economies if current.lower() in e['guild_name'].lower()]
+        current_cf = current.casefold()
+        filtered = (e for e in economies if current_cf in e['guild_name_cf'])
         
         return [
             app_commands.Choice(name=e['guild_name'], value=e['guild_name'])
-            for e in filtered[:25]
+            for e in islice(filtered, 25)
         ]
     
     @transfer.autocomplete('wallet_type')
@@ -236,135 +296,121 @@ async def setup(bot):
 class ConfirmTransferView(discord.ui.View):
     """View for confirming transfers."""
     
-    def __init__(self, bot, user_id: int, source_economy: dict, 
-                 target_economy: dict, amount: float, target_amount: float,
-                 wallet_type: str):
-        super().__init__(timeout=120)
-        self.bot = bot
+    def __init__(self, cog: TransferCommands, token: str, user_id: int):
+        super().__init__(timeout=PENDING_TRANSFER_TTL)
+        self.cog = cog
+        self.token = token
         self.user_id = user_id
-        self.source_economy = source_economy
-        self.target_economy = target_economy
-        self.amount = amount
-        self.target_amount = target_amount
-        self.wallet_type = wallet_type
+    
+    async def on_timeout(self):
+        self.cog.pending_transfers.pop(self.token, None)
     
     @discord.ui.button(label="Confirm Transfer", style=discord.ButtonStyle.green)
     async def confirm(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await interaction.response.defer()
+        
         if interaction.user.id != self.user_id:
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 "❌ This transfer belongs to someone else.",
                 ephemeral=True
             )
             return
         
-        await interaction.response.defer()
-        
-        db = self.bot.get_cog('Database')
-        unb = self.bot.get_cog('UnbelievaBoat')
-        
-        # Double-check balance
-        has_balance = await unb.user_has_sufficient_balance(
-            self.source_economy['guild_id'],
-            interaction.user.id,
-            self.amount,
-            self.wallet_type
-        )
-        
-        if not has_balance:
+        pending = self.cog.pending_transfers.pop(self.token, None)
+        if pending is None:
             await interaction.followup.send(
-                f"❌ Insufficient balance. The transfer has been cancelled.",
+                "❌ This transfer has expired. Run `/transfer` again.",
                 ephemeral=True
             )
             self.stop()
             return
         
+        db = self.cog.get_db()
+        unb = self.cog.get_unb()
+        
         # Perform transfer
         try:
-            # Deduct from source
-            if self.wallet_type == 'cash':
-                source_result = await unb.modify_user_balance(
-                    self.source_economy['guild_id'],
-                    interaction.user.id,
-                    cash_change=-self.amount,
-                    reason=f"Transfer to {self.target_economy['guild_name']}"
-                )
-            else:
-                source_result = await unb.modify_user_balance(
-                    self.source_economy['guild_id'],
-                    interaction.user.id,
-                    bank_change=-self.amount,
-                    reason=f"Transfer to {self.target_economy['guild_name']}"
+            # Deduct from source; fails if the balance no longer covers the amount
+            source_result = await unb.try_debit(
+                pending.source_economy['guild_id'],
+                interaction.user.id,
+                pending.amount,
+                pending.wallet_type,
+                reason=f"Transfer to {pending.target_economy['guild_name']}"
+            )
+            
+            if source_result is False:
+                await interaction.followup.send(
+                    "❌ Your balance changed before the transfer went through and the "
+                    "debit could not be reversed automatically. Please contact support "
+                    "so it can be refunded.",
+                    ephemeral=True
                 )
+                self.stop()
+                return
             
             if not source_result:
                 await interaction.followup.send(
-                    "❌ Failed to deduct from source account.",
+                    "❌ Insufficient balance or the source account could not be updated. "
+                    "The transfer has been cancelled.",
                     ephemeral=True
                 )
                 self.stop()
                 return
             
             # Add to target
-            if self.wallet_type == 'cash':
+            if pending.wallet_type == 'cash':
                 target_result = await unb.modify_user_balance(
-                    self.target_economy['guild_id'],
+                    pending.target_economy['guild_id'],
                     interaction.user.id,
-                    cash_change=self.target_amount,
-                    reason=f"Transfer from {self.source_economy['guild_name']}"
+                    cash_change=pending.target_amount,
+                    reason=f"Transfer from {pending.source_economy['guild_name']}"
                 )
             else:
                 target_result = await unb.modify_user_balance(
-                    self.target_economy['guild_id'],
+                    pending.target_economy['guild_id'],
                     interaction.user.id,
-                    bank_change=self.target_amount,
-                    reason=f"Transfer from {self.source_economy['guild_name']}"
+                    bank_change=pending.target_amount,
+                    reason=f"Transfer from {pending.source_economy['guild_name']}"
                 )
             
             if not target_result:
-                # Rollback: add money back to source
-                if self.wallet_type == 'cash':
-                    await unb.modify_user_balance(
-                        self.source_economy['guild_id'],
+                # Rollback: add money back to source, even if the API breaker has tripped
+                if pending.wallet_type == 'cash':
+                    rollback = await unb.modify_user_balance(
+                        pending.source_economy['guild_id'],
                         interaction.user.id,
-                        cash_change=self.amount,
-                        reason="Transfer rollback"
+                        cash_change=pending.amount,
+                        reason="Transfer rollback",
+                        bypass_breaker=True
                     )
                 else:
-                    await unb.modify_user_balance(
-                        self.source_economy['guild_id'],
+                    rollback = await unb.modify_user_balance(
+                        pending.source_economy['guild_id'],
                         interaction.user.id,
-                        bank_change=self.amount,
-                        reason="Transfer rollback"
+                        bank_change=pending.amount,
+                        reason="Transfer rollback",
+                        bypass_breaker=True
                     )
                 
-                await interaction.followup.send(
-                    "❌ Failed to add to target account. Transfer rolled back.",
-                    ephemeral=True
-                )
+                if rollback:
+                    await interaction.followup.send(
+                        "❌ Failed to add to target account. Transfer rolled back.",
+                        ephemeral=True
+                    )
+                else:
+                    logger.error(
+                        f'Transfer rollback failed: refund {pending.amount} {pending.wallet_type} '
+                        f'to user {interaction.user.id} in guild {pending.source_economy["guild_id"]}'
+                    )
+                    await interaction.followup.send(
+                        "❌ Failed to add to target account, and the amount could not be "
+                        "returned automatically. Please contact support so it can be refunded.",
+                        ephemeral=True
+                    )
                 self.stop()
                 return
             
-            # Log transfer
-            exchange_rate = self.target_economy['rate_usd'] / self.source_economy['rate_usd']
-            await db.log_transfer(
-                interaction.user.id,
-                self.source_economy['guild_id'],
-                self.target_economy['guild_id'],
-                self.amount,
-                self.target_amount,
-                self.source_economy['currency_name'],
-                self.target_economy['currency_name'],
-                self.wallet_type,
-                exchange_rate
-            )
-            
-            await db.log_action(
-                'transfer',
-                interaction.user.id,
-                self.source_economy['guild_id'],
-                f"Transferred {self.amount} to {self.target_economy['guild_name']}"
-            )
-            
             # Success message
             embed = discord.Embed(
                 title="✅ Transfer Complete!",
@@ -373,25 +419,36 @@ class ConfirmTransferView(discord.ui.View):
             )
             embed.add_field(
                 name="Sent",
-                value=f"{self.amount:,.2f} {self.source_economy['currency_symbol']} ({self.source_economy['guild_name']})",
+                value=f"{pending.amount:,.2f} {pending.source_economy['currency_symbol']} ({pending.source_economy['guild_name']})",
                 inline=False
             )
             embed.add_field(
                 name="Received",
-                value=f"{self.target_amount:,.2f} {self.target_economy['currency_symbol']} ({self.target_economy['guild_name']})",
+                value=f"{pending.target_amount:,.2f} {pending.target_economy['currency_symbol']} ({pending.target_economy['guild_name']})",
                 inline=False
             )
             embed.add_field(
                 name="Wallet",
-                value=self.wallet_type.capitalize(),
+                value=pending.wallet_type.capitalize(),
                 inline=True
             )
             
-            # Disable buttons
-            for item in self.children:
-                item.disabled = True
-            
-            await interaction.edit_original_response(embed=embed, view=self)
+            # Logging and the success edit are independent once both balances moved
+            await asyncio.gather(
+                db.log_transfer_with_action(
+                    interaction.user.id,
+                    pending.source_economy['guild_id'],
+                    pending.target_economy['guild_id'],
+                    pending.amount,
+                    pending.target_amount,
+                    pending.source_economy['currency_name'],
+                    pending.target_economy['currency_name'],
+                    pending.wallet_type,
+                    pending.exchange_rate,
+                    f"Transferred {pending.amount} to {pending.target_economy['guild_name']}"
+                ),
+                interaction.edit_original_response(embed=embed, view=None)
+            )
             
         except Exception as e:
             logger.error(f'Transfer error: {e}')
@@ -411,5 +468,6 @@ class ConfirmTransferView(discord.ui.View):
             )
             return
         
+        self.cog.pending_transfers.pop(self.token, None)
         await interaction.response.send_message("❌ Transfer cancelled.", ephemeral=True)
         self.stop()
@@ -3,77 +3,304 @@ from discord.ext import commands
 import aiohttp
 import asyncio
 import logging
-from typing import Optional, Dict, Any
+import random
+import time
+from collections import OrderedDict
+from decimal import Decimal
+from typing import Optional, Dict, Any, List, Tuple, Union
+from yarl import URL
+
+try:
+    import orjson  # Faster JSON encode/decode where available
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    import json
+    _json_loads = json.loads
+    
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
 
 logger = logging.getLogger('BankerBot.UnbelievaBoat')
 
+_BALANCE_KEYS = ('reason', 'cash', 'bank')
+
+
+def _to_num(value) -> Union[int, Decimal]:
+    """Parse an API amount as an int, or a Decimal if it isn't whole, without a float round trip."""
+    if isinstance(value, int):
+        return value
+    text = str(value)
+    try:
+        return int(text)
+    except ValueError:
+        return Decimal(text)
+
+
+def _to_api(value) -> str:
+    """Render an amount for the API: whole numbers without '.0', never in scientific notation."""
+    if isinstance(value, int):
+        return str(value)
+    value = Decimal(repr(value)) if isinstance(value, float) else Decimal(value)
+    if value.is_finite() and value == value.to_integral_value():
+        return format(int(value), 'd')
+    return format(value, 'f')
+
+
+def _parse_balance(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Balance dict with the same keys for reads and writes, so cached entries match."""
+    return {
+        'cash': _to_num(data.get('cash', 0)),
+        'bank': _to_num(data.get('bank', 0)),
+        'total': _to_num(data.get('total', 0)),
+        'rank': data.get('rank')
+    }
+
+
+def _balance_body(reason: str, cash: Optional[float], bank: Optional[float]) -> Dict[str, str]:
+    """Body for a balance PUT/PATCH, leaving out wallets that aren't being changed."""
+    # UNB API expects strings for numbers
+    values = (reason, None if cash is None else _to_api(cash), None if bank is None else _to_api(bank))
+    return {k: v for k, v in zip(_BALANCE_KEYS, values) if v is not None}
+
+
+class RateLimiter:
+    """
+    Leaky-bucket limiter allowing up to max_rate requests per time_period.
+    
+    Requests under the quota go straight through; only the excess waits
+    for the bucket to drain. The rate adapts AIMD-style: it climbs by alpha
+    after each success, up to the configured ceiling, and is multiplied by
+    beta when the API pushes back.
+    """
+    
+    def __init__(self, max_rate: float, time_period: float = 1.0,
+                 min_rate: float = 1.0, alpha: float = 0.5, beta: float = 0.5):
+        self.max_rate = max_rate
+        self.ceiling = max_rate
+        self.min_rate = min(min_rate, max_rate)
+        self.alpha = alpha
+        self.beta = beta
+        self.time_period = time_period
+        self._level = 0.0
+        self._last = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    def _leak(self):
+        now = time.monotonic()
+        self._level = max(0.0, self._level - (now - self._last) * self.max_rate / self.time_period)
+        self._last = now
+    
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                self._leak()
+                if self._level + 1 <= self.max_rate:
+                    self._level += 1
+                    return
+                await asyncio.sleep((self._level + 1 - self.max_rate) * self.time_period / self.max_rate)
+    
+    def increase(self):
+        """Additively raise the rate after a successful request."""
+        self._leak()
+        self.max_rate = min(self.ceiling, self.max_rate + self.alpha)
+    
+    def decrease(self):
+        """Multiplicatively cut the rate after a 429 or server error."""
+        self._leak()
+        self.max_rate = max(self.min_rate, self.max_rate * self.beta)
+    
+    def drain(self):
+        """Mark the bucket full so further requests wait a whole period."""
+        self._leak()
+        self._level = self.max_rate
+    
+    async def __aenter__(self):
+        await self.acquire()
+    
+    async def __aexit__(self, *exc):
+        return False
+
+
+class TTLCache:
+    """Small LRU cache whose entries expire ttl seconds after they are stored."""
+    
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()
+    
+    def get(self, key):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return entry[1]
+    
+    def set(self, key, value):
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+    
+    def pop(self, key):
+        self._data.pop(key, None)
+
+
 class UnbelievaBoat(commands.Cog):
     """Handles all interactions with the UnbelievaBoat API."""
     
     BASE_URL = "https://unbelievaboat.com/api"
+    MAX_RETRIES = 6
+    MAX_BACKOFF = 30.0  # Seconds
+    BREAKER_THRESHOLD = 10  # Consecutive failures before failing fast
+    BREAKER_COOLOFF = 30.0  # Seconds
+    BULK_CONCURRENCY = 8  # Matches the shared connector's limit_per_host
     
     def __init__(self, bot):
         self.bot = bot
         self.api_key = bot.config['unb_api_key']
-        self.api_delay = bot.config['api_delay']
-        self.session: Optional[aiohttp.ClientSession] = None
-    
-    async def cog_load(self):
-        """Called when the cog is loaded."""
-        self.session = aiohttp.ClientSession(
-            headers={
-                'Authorization': self.api_key,
-                'Accept': 'application/json'
-            }
+        self._limiter = RateLimiter(
+            bot.config.get('unb_max_rate', 10),
+            bot.config.get('unb_period', 5.0)
         )
-        logger.info('UnbelievaBoat API session initialized')
+        self.headers = {
+            'Authorization': self.api_key,
+            'Accept': 'application/json'
+        }
+        self.json_headers = {**self.headers, 'Content-Type': 'application/json'}
+        self._inflight: Dict[Tuple[int, int], asyncio.Task] = {}
+        self._consec_failures = 0
+        self._breaker_open_until = 0.0
+        # Covers the check-then-act reads within one interaction
+        self._balance_cache = TTLCache(maxsize=4096, ttl=3.0)
+        self._guild_access_cache = TTLCache(maxsize=1024, ttl=300.0)
     
-    async def cog_unload(self):
-        """Called when the cog is unloaded."""
-        if self.session:
-            await self.session.close()
-            logger.info('UnbelievaBoat API session closed')
+    @property
+    def session(self) -> Optional[aiohttp.ClientSession]:
+        """The bot-wide HTTP session created in bot.py."""
+        return getattr(self.bot, 'http_session', None)
+    
+    def _check_quota(self, headers):
+        """Pause proactively when the API reports under 10% of its quota left."""
+        remaining = headers.get('X-RateLimit-Remaining')
+        limit = headers.get('X-RateLimit-Limit')
+        if remaining is None or limit is None:
+            return
+        try:
+            if int(remaining) < int(limit) * 0.1:
+                self._limiter.drain()
+        except ValueError:
+            pass
+    
+    def _record_failure(self):
+        """Count a failed request, opening the breaker after BREAKER_THRESHOLD in a row."""
+        self._consec_failures += 1
+        if self._consec_failures < self.BREAKER_THRESHOLD:
+            return
+        now = time.monotonic()
+        if now >= self._breaker_open_until:
+            logger.error('UnbelievaBoat API failed %d times in a row, pausing requests for %.0fs',
+                         self._consec_failures, self.BREAKER_COOLOFF)
+        # After the cooloff one failed trial call is enough to reopen it
+        self._breaker_open_until = now + self.BREAKER_COOLOFF
+    
+    @staticmethod
+    def _retry_after(headers) -> Optional[float]:
+        """Seconds until a 429 can be retried, from X-RateLimit-Reset or Retry-After."""
+        try:
+            reset = headers.get('X-RateLimit-Reset')
+            if reset is not None:
+                reset = float(reset)
+                if reset > 1e11:  # Epoch milliseconds rather than seconds
+                    reset /= 1000
+                return max(0.0, reset - time.time())
+            retry_after = headers.get('Retry-After')
+            if retry_after is not None:
+                return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+        return None
     
     async def _make_request(self, method: str, endpoint: str, 
-                           json_data: Optional[Dict] = None) -> Optional[Dict[str, Any]]:
-        """Make a request to the UnbelievaBoat API with rate limiting."""
-        if not self.session:
+                           json_data: Optional[Dict] = None,
+                           bypass_breaker: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Make a request to the UnbelievaBoat API with rate limiting and bounded 429 retries.
+        
+        bypass_breaker is for compensating writes (rollbacks and reverts),
+        which must still be attempted while the circuit breaker is open.
+        """
+        if not self.session or self.session.closed:
             logger.error('API session not initialized')
             return None
         
-        url = f"{self.BASE_URL}{endpoint}"
+        # Fail fast while the breaker is open instead of spending quota on a failing API
+        if not bypass_breaker and time.monotonic() < self._breaker_open_until:
+            return None
         
-        try:
-            # Rate limiting
-            await asyncio.sleep(self.api_delay)
+        # Endpoints are built from integer IDs, so yarl's quoting pass can be skipped
+        url = URL(self.BASE_URL + endpoint, encoded=True)
+        # Encode once; retries resend the same bytes
+        if json_data is not None:
+            body, headers = _json_dumps(json_data), self.json_headers
+        else:
+            body, headers = None, self.headers
+        
+        for attempt in range(self.MAX_RETRIES):
+            try:
+                async with self._limiter, self.session.request(method, url, data=body, headers=headers) as response:
+                    self._check_quota(response.headers)
+                    if response.status < 500 and response.status != 429:
+                        self._consec_failures = 0
+                    if response.status == 200:
+                        self._limiter.increase()
+                        data = _json_loads(await response.read())
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug('API request successful: %s %s', method, endpoint)
+                        return data
+                    elif response.status == 429:
+                        # Rate limited: wait as long as the API asks, else back off exponentially
+                        retry_after = self._retry_after(response.headers)
+                        self._limiter.decrease()
+                        self._limiter.drain()
+                        if retry_after is None:
+                            retry_after = 2 ** attempt
+                        delay = min(retry_after, self.MAX_BACKOFF) + random.random() * 0.25
+                    elif response.status == 404:
+                        logger.error('Resource not found: %s', endpoint)
+                        return None
+                    elif response.status == 403:
+                        logger.error('Forbidden: Check API permissions for %s', endpoint)
+                        return None
+                    else:
+                        if response.status >= 500:
+                            self._limiter.decrease()
+                            self._record_failure()
+                        # Raw bytes skip charset detection; the excerpt is only logged
+                        error_text = (await response.read())[:512].decode('utf-8', 'replace')
+                        logger.error('API error %s on %s %s: %s', response.status, method, endpoint, error_text)
+                        return None
+            except aiohttp.ClientError as e:
+                logger.error('Network error during API request %s %s: %s', method, endpoint, e)
+                self._record_failure()
+                return None
+            except Exception as e:
+                logger.error('Unexpected error during API request %s %s: %s', method, endpoint, e)
+                return None
             
-            async with self.session.request(method, url, json=json_data) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    logger.debug(f'API request successful: {method} {endpoint}')
-                    return data
-                elif response.status == 429:
-                    # Rate limited
-                    retry_after = int(response.headers.get('Retry-After', 60))
-                    logger.warning(f'Rate limited, retrying after {retry_after}s')
-                    await asyncio.sleep(retry_after)
-                    return await self._make_request(method, endpoint, json_data)
-                elif response.status == 404:
-                    logger.error(f'Resource not found: {endpoint}')
-                    return None
-                elif response.status == 403:
-                    logger.error(f'Forbidden: Check API permissions for {endpoint}')
-                    return None
-                else:
-                    error_text = await response.text()
-                    logger.error(f'API error {response.status}: {error_text}')
-                    return None
-        except aiohttp.ClientError as e:
-            logger.error(f'Network error during API request: {e}')
-            return None
-        except Exception as e:
-            logger.error(f'Unexpected error during API request: {e}')
-            return None
+            # Sleep outside the response context so the connection goes back to the pool
+            if attempt + 1 < self.MAX_RETRIES:
+                logger.warning('Rate limited on %s %s (attempt %d/%d), retrying in %.2fs',
+                               method, endpoint, attempt + 1, self.MAX_RETRIES, delay)
+                await asyncio.sleep(delay)
+        
+        logger.error('Giving up on %s %s after %d rate-limited attempts', method, endpoint, self.MAX_RETRIES)
+        self._record_failure()
+        return None
     
     # ========================================================================
     # USER BALANCE OPERATIONS
@@ -83,21 +310,49 @@ class UnbelievaBoat(commands.Cog):
         """
         Get a user's balance in a specific guild.
         
+        Concurrent calls for the same user share one in-flight request.
+        
         Returns:
-            Dict with 'cash', 'bank', and 'total' keys, or None if error
+            Dict with 'cash', 'bank', 'total' and 'rank' keys, or None if error
         """
+        key = (guild_id, user_id)
+        cached = self._balance_cache.get(key)
+        if cached is not None:
+            return dict(cached)
+        
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch_user_balance(guild_id, user_id))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._inflight.pop(key) if self._inflight.get(key) is t else None)
+        # Shielded so one caller giving up doesn't cancel the others' request
+        balance = await asyncio.shield(task)
+        # Each caller gets its own copy; the shared result is also the cached entry
+        return dict(balance) if balance is not None else None
+    
+    async def get_user_balances(self, guild_id: int,
+                                user_ids: List[int]) -> List[Optional[Dict[str, Any]]]:
+        """Get several users' balances in one guild concurrently, in user_ids order."""
+        return await asyncio.gather(*(self.get_user_balance(guild_id, u) for u in user_ids))
+    
+    async def _fetch_user_balance(self, guild_id: int, user_id: int) -> Optional[Dict[str, Any]]:
         endpoint = f"/guilds/{guild_id}/users/{user_id}"
         data = await self._make_request('GET', endpoint)
         
         if data:
-            return {
-                'cash': float(data.get('cash', 0)),
-                'bank': float(data.get('bank', 0)),
-                'total': float(data.get('total', 0)),
-                'rank': data.get('rank')
-            }
+            balance = _parse_balance(data)
+            # A write detaches the in-flight read, whose result may then predate it
+            key = (guild_id, user_id)
+            if self._inflight.get(key) is asyncio.current_task():
+                self._balance_cache.set(key, balance)
+            return balance
         return None
     
+    def _forget_balance(self, key: Tuple[int, int]):
+        """Drop the cached balance and stop any in-flight read from caching its result."""
+        self._balance_cache.pop(key)
+        self._inflight.pop(key, None)
+    
     async def set_user_balance(self, guild_id: int, user_id: int, 
                               cash: Optional[float] = None, 
                               bank: Optional[float] = None,
@@ -115,63 +370,116 @@ class UnbelievaBoat(commands.Cog):
         Returns:
             Updated balance data or None if error
         """
+        self._forget_balance((guild_id, user_id))
         endpoint = f"/guilds/{guild_id}/users/{user_id}"
         
-        json_data = {'reason': reason}
-        if cash is not None:
-            json_data['cash'] = str(cash)  # UNB API expects strings for numbers
-        if bank is not None:
-            json_data['bank'] = str(bank)
-        
-        data = await self._make_request('PATCH', endpoint, json_data)
+        data = await self._make_request('PUT', endpoint, _balance_body(reason, cash, bank))
         
         if data:
-            return {
-                'cash': float(data.get('cash', 0)),
-                'bank': float(data.get('bank', 0)),
-                'total': float(data.get('total', 0))
-            }
+            balance = _parse_balance(data)
+            # Reads that overlapped this write may have seen the old balance
+            self._forget_balance((guild_id, user_id))
+            self._balance_cache.set((guild_id, user_id), dict(balance))
+            return balance
         return None
     
     async def modify_user_balance(self, guild_id: int, user_id: int,
                                  cash_change: Optional[float] = None,
                                  bank_change: Optional[float] = None,
-                                 reason: str = "BankerBot transfer") -> Optional[Dict[str, Any]]:
+                                 reason: str = "BankerBot transfer",
+                                 bypass_breaker: bool = False) -> Optional[Dict[str, Any]]:
         """
         Modify a user's balance by adding or subtracting amounts.
         
+        No overdraft check is made: UnbelievaBoat applies a negative delta
+        even if the wallet ends up below zero, and this only logs a warning
+        when that happens. Use try_debit to take money only if it's there.
+        
         Args:
             guild_id: The Discord guild ID
             user_id: The Discord user ID
             cash_change: Amount to add/subtract from cash (positive or negative)
             bank_change: Amount to add/subtract from bank (positive or negative)
             reason: Reason for the change
+            bypass_breaker: Send even while the circuit breaker is open; for rollbacks
         
         Returns:
             Updated balance data or None if error
         """
-        # First, get current balance
-        current = await self.get_user_balance(guild_id, user_id)
-        if not current:
-            logger.error(f'Could not get current balance for user {user_id} in guild {guild_id}')
-            return None
+        self._forget_balance((guild_id, user_id))
+        endpoint = f"/guilds/{guild_id}/users/{user_id}"
         
-        # Calculate new balances
-        new_cash = current['cash']
-        new_bank = current['bank']
+        # PATCH applies the amounts as deltas server-side, so no read is needed first
+        data = await self._make_request('PATCH', endpoint, _balance_body(reason, cash_change, bank_change),
+                                        bypass_breaker=bypass_breaker)
         
-        if cash_change is not None:
-            new_cash += cash_change
-        if bank_change is not None:
-            new_bank += bank_change
+        if data:
+            balance = _parse_balance(data)
+            for wallet, change in (('cash', cash_change), ('bank', bank_change)):
+                if change is not None and change < 0 and balance[wallet] < 0:
+                    logger.warning('%s change of %s left user %s in guild %s overdrawn at %s',
+                                   wallet, change, user_id, guild_id, balance[wallet])
+            # Reads that overlapped this write may have seen the old balance
+            self._forget_balance((guild_id, user_id))
+            self._balance_cache.set((guild_id, user_id), dict(balance))
+            return balance
+        return None
+    
+    async def bulk_modify_balances(self, guild_id: int,
+                                   changes: List[Tuple[int, Optional[float], Optional[float]]],
+                                   reason: str = "BankerBot transfer") -> List[Any]:
+        """
+        Apply (user_id, cash_change, bank_change) deltas for many users in one guild.
+        
+        Up to BULK_CONCURRENCY requests run at once, all still paced by the
+        rate limiter. Like modify_user_balance, negative deltas are applied
+        without an overdraft check and can leave wallets below zero.
         
-        # Ensure balances don't go negative
-        if new_cash < 0 or new_bank < 0:
-            logger.error(f'Balance modification would result in negative balance')
+        Returns:
+            One entry per change, in order: updated balance data, None on
+            error, or the exception the request raised
+        """
+        sem = asyncio.Semaphore(self.BULK_CONCURRENCY)
+        
+        async def one(user_id, cash_change, bank_change):
+            async with sem:
+                return await self.modify_user_balance(guild_id, user_id, cash_change, bank_change, reason)
+        
+        return await asyncio.gather(*(one(*change) for change in changes), return_exceptions=True)
+    
+    async def try_debit(self, guild_id: int, user_id: int, amount: float,
+                        wallet_type: str, reason: str = "BankerBot transfer") -> Union[Dict[str, Any], None, bool]:
+        """
+        Deduct an amount from one wallet if the user can cover it.
+        
+        The debit is a single delta PATCH. UnbelievaBoat does not refuse
+        overdrafts, so a debit that leaves the wallet negative is credited
+        straight back and treated as insufficient funds.
+        
+        Returns:
+            Updated balance data; None if the balance is insufficient or on
+            error (nothing was taken); False if an overdraft could not be
+            reverted, so the user is left debited and needs a manual repair
+        """
+        wallet = wallet_type.lower()
+        if wallet not in ('cash', 'bank'):
             return None
         
-        # Set new balances
-        return await self.set_user_balance(guild_id, user_id, new_cash, new_bank, reason)
+        result = await self.modify_user_balance(guild_id, user_id, reason=reason,
+                                                **{f'{wallet}_change': -amount})
+        if result is None:
+            return None
+        
+        if result[wallet] < 0:
+            logger.warning('Insufficient %s for user %s in guild %s, reverting debit', wallet, user_id, guild_id)
+            reverted = await self.modify_user_balance(guild_id, user_id, reason=f"{reason} (reverted)",
+                                                      bypass_breaker=True, **{f'{wallet}_change': amount})
+            if reverted is None:
+                logger.error('Could not revert overdraft debit of %s %s for user %s in guild %s; '
+                             'refund it manually', amount, wallet, user_id, guild_id)
+                return False
+            return None
+        return result
     
     # ========================================================================
     # VALIDATION
@@ -184,12 +492,19 @@ class UnbelievaBoat(commands.Cog):
         Returns:
             True if access is valid, False otherwise
         """
+        if self._guild_access_cache.get(guild_id):
+            return True
+        
         endpoint = f"/guilds/{guild_id}"
         data = await self._make_request('GET', endpoint)
+        # Only success is cached, so granting access takes effect on the next try
+        if data is not None:
+            self._guild_access_cache.set(guild_id, True)
         return data is not None
     
     async def user_has_sufficient_balance(self, guild_id: int, user_id: int,
-                                         amount: float, wallet_type: str) -> bool:
+                                         amount: float, wallet_type: str,
+                                         balance: Optional[Dict[str, Any]] = None) -> bool:
         """
         Check if a user has sufficient balance for a transfer.
         
@@ -198,18 +513,20 @@ class UnbelievaBoat(commands.Cog):
             user_id: The Discord user ID
             amount: Amount needed
             wallet_type: 'cash' or 'bank'
+            balance: A balance the caller already fetched; read (or served
+                from the short-lived cache) when omitted
         
         Returns:
             True if user has sufficient balance, False otherwise
         """
-        balance = await self.get_user_balance(guild_id, user_id)
+        if balance is None:
+            balance = await self.get_user_balance(guild_id, user_id)
         if not balance:
             return False
         
-        if wallet_type.lower() == 'cash':
-            return balance['cash'] >= amount
-        elif wallet_type.lower() == 'bank':
-            return balance['bank'] >= amount
+        wallet = wallet_type.lower()
+        if wallet in ('cash', 'bank'):
+            return balance[wallet] >= amount
         return False
 
 async def setup(bot):